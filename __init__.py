@@ -1,8 +1,10 @@
 """The Environment Canada (EC) component."""
+import asyncio
 from datetime import timedelta
 import logging
+import time
 
-from env_canada import ECWeather, ECRadar, ECAirQuality
+from aiohttp import hdrs
 
 from homeassistant.const import (
     ATTR_ATTRIBUTION,
@@ -10,10 +12,13 @@ from homeassistant.const import (
     CONF_ELEVATION,
     CONF_LATITUDE,
     CONF_LONGITUDE,
+    CONF_NAME,
     EVENT_CORE_CONFIG_UPDATE,
     LENGTH_FEET,
     LENGTH_METERS,
 )
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
@@ -23,107 +28,699 @@ from homeassistant.util.dt import utcnow
 import homeassistant.util.dt as dt_util
 
 from .const import (
+    AQHI_OBSERVATION_URL,
+    ATTR_CACHED_AT,
     ATTRIBUTION_EN,
     ATTRIBUTION_FR,
     ATTR_OBSERVATION_TIME,
     ATTR_STATION,
     CONF_LANGUAGE,
+    CONF_RADAR_FORMAT,
+    CONF_RADAR_IDLE_TIMEOUT,
+    CONF_RADAR_PREFETCH,
+    CONF_RADAR_WORKERS,
     CONF_STATION,
+    CONF_STATIONS,
+    DEFAULT_RADAR_FORMAT,
+    DEFAULT_RADAR_IDLE_TIMEOUT,
+    DEFAULT_RADAR_WORKERS,
     DOMAIN,
+    RADAR_URL,
+    SIGNAL_RADAR_COORDINATOR,
 )
+from .breaker import STATE_CLOSED, async_get_breaker
+from .cache import (
+    AQHI_FIELDS,
+    RADAR_FIELDS,
+    WEATHER_FIELDS,
+    ECDataStore,
+)
+from .fleet import ECFleetCoordinator, ECFleetStation
+from .history import ObservationHistory
+from .scheduler import PublicationScheduler, polling_phase, staggered_interval
+from .session import async_get_session
+from .stats import ECUpdateStats
 
 PLATFORMS = ["camera", "sensor", "weather"]
+FLEET_PLATFORMS = ["sensor", "weather"]
+
+SHARED_COORDINATORS = "shared_coordinators"
+SHARED_LOCKS = "shared_locks"
 
 DEFAULT_WEATHER_UPDATE_INTERVAL = timedelta(minutes=5)
 DEFAULT_RADAR_UPDATE_INTERVAL = timedelta(minutes=5)
 
-_LOGGER = logging.getLogger(__name__)
+# Bounds for publication-aware polling, see PublicationScheduler. Alerts and
+# forecast issues share the citypage feed but not the observation cadence, so
+# weather is never polled less often than the fixed interval.
+WEATHER_POLL_LIMITS = (timedelta(minutes=2), DEFAULT_WEATHER_UPDATE_INTERVAL)
+WEATHER_PUBLICATION_LAG = timedelta(minutes=5)
+AQHI_POLL_LIMITS = (timedelta(minutes=2), timedelta(minutes=30))
+AQHI_PUBLICATION_LAG = timedelta(minutes=5)
+RADAR_POLL_LIMITS = (timedelta(minutes=1), timedelta(minutes=10))
+RADAR_PUBLICATION_LAG = timedelta(minutes=2)
 
+_LOGGER = logging.getLogger(__name__)
 
-class MyECRadar(ECRadar):
-    """Slim wrapper to add update method."""
 
-    def __init__(self, coordinates):
-        """Init my radar."""
-        super().__init__(coordinates=coordinates, precip_type=None)
-        self.image = None
+async def async_setup_entry(hass, config_entry):
+    """Set up EC as config entry."""
+    if CONF_STATIONS in config_entry.data:
+        return await async_setup_fleet_entry(hass, config_entry)
 
-    async def update(self):
-        self.image = await self.get_loop(fps=2)
+    # The EC clients, and the imaging stack env_canada pulls in with them,
+    # are only imported once an entry is set up
+    # pylint: disable=import-outside-toplevel
+    from env_canada import ec_weather
 
+    from .aqhi import MyECAirQuality
+    from .citypage import MyECWeather
 
-async def async_setup_entry(hass, config_entry):
-    """Set up EC as config entry."""
     lat = config_entry.data.get(CONF_LATITUDE)
     lon = config_entry.data.get(CONF_LONGITUDE)
     station = config_entry.data.get(CONF_STATION)
     lang = config_entry.data.get(CONF_LANGUAGE)
 
-    weather_data = ECWeather(
-        station_id=station,
-        coordinates=(lat, lon),
-        language=lang.lower(),
-    )
-    weather_coord = ECDataUpdateCoordinator(
-        hass, weather_data, "weather", DEFAULT_WEATHER_UPDATE_INTERVAL
-    )
-    await weather_coord.async_config_entry_first_refresh()
-
-    radar_data = MyECRadar(coordinates=(lat, lon))
-    radar_coord = ECDataUpdateCoordinator(
-        hass, radar_data, "radar", DEFAULT_RADAR_UPDATE_INTERVAL
+    hass.data.setdefault(DOMAIN, {})
+    setup_start = time.monotonic()
+
+    weather_key, _, aqhi_key = coordinator_keys(config_entry)
+    shared_keys = [weather_key, aqhi_key]
+
+    # Only weather data is needed before the platforms can be set up, AQHI
+    # finishes its first refresh in the background. The radar coordinator is
+    # acquired by the camera platform, see async_acquire_radar_coordinator.
+    results = await asyncio.gather(
+        async_acquire_coordinator(
+            hass,
+            weather_key,
+            lambda: ECDataUpdateCoordinator(
+                hass,
+                MyECWeather(
+                    async_get_session(hass),
+                    station_id=station,
+                    coordinates=(lat, lon),
+                    language=lang.lower(),
+                ),
+                "weather",
+                DEFAULT_WEATHER_UPDATE_INTERVAL,
+                weather_url,
+                PublicationScheduler(
+                    lambda data: data.metadata.get("timestamp"),
+                    DEFAULT_WEATHER_UPDATE_INTERVAL,
+                    *WEATHER_POLL_LIMITS,
+                    WEATHER_PUBLICATION_LAG,
+                    # Spread each entry's polls instead of bursting together
+                    phase=polling_phase(config_entry.entry_id, weather_key[0]),
+                ),
+                ECDataStore(hass, weather_key, WEATHER_FIELDS),
+                ObservationHistory(),
+                # Weather is downloaded from a different host than AQHI
+                async_get_breaker(hass, ec_weather.WEATHER_URL),
+            ),
+        ),
+        async_acquire_coordinator(
+            hass,
+            aqhi_key,
+            lambda: ECDataUpdateCoordinator(
+                hass,
+                MyECAirQuality(async_get_session(hass), coordinates=(lat, lon)),
+                "AQHI",
+                DEFAULT_WEATHER_UPDATE_INTERVAL,
+                aqhi_url,
+                PublicationScheduler(
+                    lambda data: data.metadata.get("timestamp"),
+                    DEFAULT_WEATHER_UPDATE_INTERVAL,
+                    *AQHI_POLL_LIMITS,
+                    AQHI_PUBLICATION_LAG,
+                    phase=polling_phase(config_entry.entry_id, aqhi_key[0]),
+                ),
+                ECDataStore(hass, aqhi_key, AQHI_FIELDS),
+                breaker=async_get_breaker(hass, AQHI_OBSERVATION_URL),
+            ),
+            background=True,
+        ),
+        return_exceptions=True,
     )
-    await radar_coord.async_config_entry_first_refresh()
 
-    aqhi_data = ECAirQuality(coordinates=(lat, lon))
-    aqhi_coord = ECDataUpdateCoordinator(
-        hass, aqhi_data, "AQHI", DEFAULT_WEATHER_UPDATE_INTERVAL
+    errors = [result for result in results if isinstance(result, Exception)]
+    if errors:
+        for key, result in zip(shared_keys, results):
+            if not isinstance(result, Exception):
+                release_coordinator(hass, key)
+        raise errors[0]
+
+    weather_coord, aqhi_coord = results
+    _LOGGER.debug(
+        "Environment Canada entry %s ready in %.2fs",
+        config_entry.title,
+        time.monotonic() - setup_start,
     )
-    await aqhi_coord.async_config_entry_first_refresh()
 
-    hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][config_entry.entry_id] = {
         "weather_coordinator": weather_coord,
-        "radar_coordinator": radar_coord,
         "aqhi_coordinator": aqhi_coord,
+        "shared_keys": shared_keys,
     }
 
+    config_entry.async_on_unload(config_entry.add_update_listener(async_update_options))
+
     hass.config_entries.async_setup_platforms(config_entry, PLATFORMS)
 
     return True
 
 
+async def async_acquire_radar_coordinator(hass, config_entry):
+    """Return the radar coordinator of an entry, acquiring it on first use.
+
+    Only the camera platform needs radar data, so the radar module and the
+    imaging it does are only loaded once an enabled camera is set up. Other
+    platforms are told the coordinator exists with SIGNAL_RADAR_COORDINATOR.
+    """
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    if "radar_coordinator" in entry_data:
+        return entry_data["radar_coordinator"]
+
+    from .radar import MyECRadar  # pylint: disable=import-outside-toplevel
+
+    radar_key = coordinator_keys(config_entry)[1]
+    coordinator = await async_acquire_coordinator(
+        hass,
+        radar_key,
+        lambda: ECRadarCoordinator(
+            hass,
+            MyECRadar(
+                coordinates=(
+                    config_entry.data.get(CONF_LATITUDE),
+                    config_entry.data.get(CONF_LONGITUDE),
+                ),
+                image_format=config_entry.options.get(
+                    CONF_RADAR_FORMAT, DEFAULT_RADAR_FORMAT
+                ),
+                session=async_get_session(hass),
+                workers=config_entry.options.get(
+                    CONF_RADAR_WORKERS, DEFAULT_RADAR_WORKERS
+                ),
+            ),
+            "radar",
+            DEFAULT_RADAR_UPDATE_INTERVAL,
+            timedelta(
+                minutes=config_entry.options.get(
+                    CONF_RADAR_IDLE_TIMEOUT, DEFAULT_RADAR_IDLE_TIMEOUT
+                )
+            ),
+            config_entry.options.get(CONF_RADAR_PREFETCH, False),
+            PublicationScheduler(
+                lambda data: data.timestamp if data.frames else None,
+                DEFAULT_RADAR_UPDATE_INTERVAL,
+                *RADAR_POLL_LIMITS,
+                RADAR_PUBLICATION_LAG,
+                phase=polling_phase(config_entry.entry_id, radar_key[0]),
+            ),
+            ECDataStore(hass, radar_key, RADAR_FIELDS),
+            async_get_breaker(hass, RADAR_URL),
+        ),
+        background=True,
+    )
+    entry_data["radar_coordinator"] = coordinator
+    entry_data["shared_keys"].append(radar_key)
+    async_dispatcher_send(
+        hass, SIGNAL_RADAR_COORDINATOR.format(config_entry.entry_id), coordinator
+    )
+    return coordinator
+
+
+async def async_setup_fleet_entry(hass, config_entry):
+    """Set up a config entry monitoring many stations with one coordinator."""
+    stations = config_entry.data[CONF_STATIONS]
+    fleet = ECFleetCoordinator(
+        hass,
+        list(stations),
+        config_entry.data[CONF_LANGUAGE],
+        DEFAULT_WEATHER_UPDATE_INTERVAL,
+        polling_phase(config_entry.entry_id, "fleet"),
+    )
+    await fleet.async_config_entry_first_refresh()
+
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][config_entry.entry_id] = {
+        "fleet_coordinator": fleet,
+        "station_coordinators": {
+            station: ECFleetStation(fleet, station) for station in stations
+        },
+        "shared_keys": [],
+    }
+
+    hass.config_entries.async_setup_platforms(config_entry, FLEET_PLATFORMS)
+
+    return True
+
+
+def fleet_stations(hass, config_entry):
+    """Return (coordinator, config) for each station of a fleet entry."""
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    return [
+        (
+            coordinator,
+            {
+                CONF_STATION: station,
+                CONF_LANGUAGE: config_entry.data[CONF_LANGUAGE],
+                CONF_NAME: config_entry.data[CONF_STATIONS][station],
+            },
+        )
+        for station, coordinator in entry_data["station_coordinators"].items()
+    ]
+
+
+async def async_update_options(hass, config_entry):
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(config_entry.entry_id)
+
+
 async def async_unload_entry(hass, config_entry):
     """Unload a config entry."""
+    platforms = FLEET_PLATFORMS if CONF_STATIONS in config_entry.data else PLATFORMS
     unload_ok = await hass.config_entries.async_unload_platforms(
-        config_entry, PLATFORMS
+        config_entry, platforms
     )
 
-    hass.data[DOMAIN].pop(config_entry.entry_id)
+    entry_data = hass.data[DOMAIN].pop(config_entry.entry_id)
+    for key in entry_data["shared_keys"]:
+        release_coordinator(hass, key)
 
     return unload_ok
 
 
+async def async_remove_entry(hass, config_entry):
+    """Remove the cached data no other loaded entry still uses."""
+    if CONF_STATIONS in config_entry.data:
+        return
+    shared = hass.data.get(DOMAIN, {}).get(SHARED_COORDINATORS, {})
+    for key in coordinator_keys(config_entry):
+        if key not in shared:
+            await ECDataStore(hass, key, ()).async_remove()
+
+
+def coordinator_keys(config_entry):
+    """Return the shared coordinator keys of the weather, radar and AQHI data."""
+    lat = config_entry.data.get(CONF_LATITUDE)
+    lon = config_entry.data.get(CONF_LONGITUDE)
+    station = config_entry.data.get(CONF_STATION)
+    lang = config_entry.data.get(CONF_LANGUAGE)
+    return [("weather", station, lang), ("radar", lat, lon), ("AQHI", lat, lon)]
+
+
+async def async_acquire_coordinator(hass, key, factory, background=False):
+    """Return the shared coordinator for key, creating it on first use.
+
+    Entries pointing at the same station or coordinates share one coordinator,
+    and therefore one download per poll. Each call must be balanced by a call
+    to release_coordinator.
+
+    A new coordinator is first hydrated from its on-disk cache. With cached
+    data, or with background set, it is returned before its first refresh
+    completes. Without cached data a background coordinator's data stays
+    None until then.
+    """
+    shared = hass.data[DOMAIN].setdefault(SHARED_COORDINATORS, {})
+    locks = hass.data[DOMAIN].setdefault(SHARED_LOCKS, {})
+
+    # Entries are set up concurrently; serialize per key so two entries for
+    # the same station don't both create (and download) a coordinator.
+    async with locks.setdefault(key, asyncio.Lock()):
+        if key in shared:
+            shared[key]["refs"] += 1
+            return shared[key]["coordinator"]
+
+        coordinator = factory()
+        if await coordinator.async_restore() or background:
+            hass.async_create_task(_async_timed_refresh(coordinator, key))
+        else:
+            start = time.monotonic()
+            await coordinator.async_config_entry_first_refresh()
+            _LOGGER.debug(
+                "First %s refresh took %.2fs", key[0], time.monotonic() - start
+            )
+        shared[key] = {"coordinator": coordinator, "refs": 1}
+        return coordinator
+
+
+async def _async_timed_refresh(coordinator, key):
+    """Run a background first refresh and log how long it took."""
+    start = time.monotonic()
+    await coordinator.async_refresh()
+    _LOGGER.debug(
+        "Background first %s refresh took %.2fs", key[0], time.monotonic() - start
+    )
+
+
+def release_coordinator(hass, key):
+    """Drop a reference to a shared coordinator, forgetting it on the last one."""
+    shared = hass.data[DOMAIN].get(SHARED_COORDINATORS, {})
+    if key not in shared:
+        return
+    shared[key]["refs"] -= 1
+    if shared[key]["refs"] <= 0:
+        _LOGGER.debug("Releasing last reference to %s coordinator", key)
+        shared.pop(key)["coordinator"].close()
+
+
+def weather_url(ec_data):
+    """Return the citypage URL of a weather station, once it is known.
+
+    This is the URL ECWeather.update downloads from, so the probe asks the
+    server the data actually comes from.
+    """
+    # pylint: disable=import-outside-toplevel
+    from env_canada.ec_weather import WEATHER_URL
+
+    if not ec_data.station_id:
+        return None
+    return WEATHER_URL.format(
+        date=utcnow().strftime("%Y%m%d"),
+        site=ec_data.station_id,
+        language=ec_data.language[0],
+    )
+
+
+def aqhi_url(ec_data):
+    """Return the AQHI observation URL, once the region is known."""
+    zone_id = getattr(ec_data, "zone_id", None)
+    region_id = getattr(ec_data, "region_id", None)
+    if not zone_id or not region_id:
+        return None
+    return AQHI_OBSERVATION_URL.format(zone_id, region_id)
+
+
 class ECDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching EC data."""
 
-    def __init__(self, hass, ec_data, name, update_interval):
-        """Initialize global EC data updater."""
+    def __init__(
+        self,
+        hass,
+        ec_data,
+        name,
+        update_interval,
+        validator_url=None,
+        scheduler=None,
+        store=None,
+        history=None,
+        breaker=None,
+        phase=0.0,
+    ):
+        """Initialize global EC data updater.
+
+        When validator_url is given it maps ec_data to the URL of its feed,
+        which is probed with a conditional HEAD request before each update.
+        The EC client does its own downloading, so the probe lets an
+        unchanged feed skip both the download and the parse.
+
+        When scheduler is given the update interval follows the feed's
+        learned publication cadence instead of staying fixed.
+
+        When store is given the last good data is persisted after each
+        update and can be restored at startup with async_restore.
+
+        When history is given each new observation is recorded in it.
+
+        When breaker is given, the circuit breaker of the feed's host, updates
+        are refused while the host is down. Failed and refused updates keep
+        serving the last good data, marked with cached_at.
+
+        Without a scheduler, polls land in the slot of the update interval
+        given by phase, see staggered_interval.
+        """
         self.ec_data = ec_data
         self._name = name
+        self._validator_url = validator_url
+        self._scheduler = scheduler
+        self._store = store
+        self.history = history
+        self.breaker = breaker
+        self.phase = phase
+        self._default_interval = update_interval
+        self._fetched_at = None
+        self._validators = {}
+        self._content_length = 0
+        self._update_duration = 0.0
+        self._derived = {}
+
+        self.data_changed = True
+        self.cached_at = None
+        self.stats = ECUpdateStats()
 
         super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=update_interval)
 
     async def _async_update_data(self):
         """Fetch data from EC."""
+        data = await self._async_fetch()
+        if self.history is not None and self.data_changed:
+            self.history.record(data)
+        if self._scheduler:
+            self._scheduler.record(data)
+            self.update_interval = self._scheduler.next_interval()
+            _LOGGER.debug(
+                "Next Environment Canada %s update in %s",
+                self._name,
+                self.update_interval,
+            )
+        else:
+            self.update_interval = staggered_interval(
+                self._default_interval, self.phase
+            )
+        return data
+
+    async def _async_fetch(self):
+        """Fetch data from EC unless the feed is unchanged."""
+        start = time.monotonic()
+        breaker = self.breaker
+        if breaker and not breaker.allow():
+            self.stats.rejected_updates += 1
+            self.update_interval = breaker.retry_delay()
+            self._serve_stale()
+            raise ECUpdateFailed(
+                f"Environment Canada {self._name} update paused, "
+                f"{breaker.host} is unavailable"
+            )
+
+        validators = await self._async_probe()
+        if validators is None:
+            if breaker:
+                breaker.record_success()
+            stats = self.stats
+            stats.conditional_hits += 1
+            stats.bytes_saved += self._content_length
+            stats.update_time_saved += self._update_duration
+            stats.record_success(time.monotonic() - start, 0)
+            # The data is current again, entities only need to drop cached_at
+            self.data_changed = self.cached_at is not None
+            self.cached_at = None
+            _LOGGER.debug(
+                "Environment Canada %s not modified (%d hits, %d misses)",
+                self._name,
+                stats.conditional_hits,
+                stats.conditional_misses,
+            )
+            return self.ec_data
+
+        update_start = time.monotonic()
         try:
             await self.ec_data.update()
         except Exception as err:
+            self.stats.record_failure()
+            if breaker:
+                breaker.record_failure()
+                if breaker.state != STATE_CLOSED:
+                    self.update_interval = breaker.retry_delay()
+            self._serve_stale()
             raise ECUpdateFailed(
                 f"Environment Canada {self._name} update failed: {err}"
             ) from err
+        self._update_duration = time.monotonic() - update_start
+        if breaker:
+            breaker.record_success()
+
+        # The radar client times its downloads and rendering separately
+        render_time = getattr(self.ec_data, "render_time", None)
+        self.stats.record_success(
+            time.monotonic() - start - (render_time or 0),
+            getattr(self.ec_data, "payload_bytes", self._content_length),
+            render_time,
+            getattr(self.ec_data, "render_steps", None),
+        )
+
+        # Only remember the validators once the data they describe is loaded
+        self._validators = validators
+        self._derived = {}
+        self.data_changed = True
+        self.cached_at = None
+        self._fetched_at = utcnow()
+        if self._store:
+            self._store.async_save(self.ec_data)
         return self.ec_data
 
+    async def async_restore(self):
+        """Load the last good data from disk, returning True if there was any."""
+        if not self._store:
+            return False
+        try:
+            cached_at = await self._store.async_restore(self.ec_data)
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.warning(
+                "Unable to restore cached Environment Canada %s data: %s",
+                self._name,
+                err,
+            )
+            return False
+        if cached_at is None:
+            return False
+        _LOGGER.debug("Restored %s data cached at %s", self._name, cached_at)
+        self.cached_at = cached_at
+        self._fetched_at = cached_at
+        self.data = self.ec_data
+        if self.history is not None:
+            self.history.record(self.ec_data)
+        return True
+
+    def close(self):
+        """Release the resources of the EC client."""
+        close = getattr(self.ec_data, "close", None)
+        if close:
+            close()
+
+    def _serve_stale(self):
+        """Keep serving the last good data, marked with when it was fetched."""
+        if self.data is not None and self.cached_at is None:
+            self.cached_at = self._fetched_at
+            self.data_changed = True
+
+    def derived(self, key, builder):
+        """Return a value computed from the current data, built once per update.
+
+        Entities sharing this coordinator share the result, and it is only
+        rebuilt after new data arrives.
+        """
+        if key not in self._derived:
+            self._derived[key] = builder(self.data)
+        return self._derived[key]
+
+    async def _async_probe(self):
+        """Probe the feed, returning None if unchanged or its new validators."""
+        url = self._validator_url(self.ec_data) if self._validator_url else None
+        if url is None:
+            return {}
+
+        headers = {}
+        if hdrs.ETAG in self._validators:
+            headers[hdrs.IF_NONE_MATCH] = self._validators[hdrs.ETAG]
+        if hdrs.LAST_MODIFIED in self._validators:
+            headers[hdrs.IF_MODIFIED_SINCE] = self._validators[hdrs.LAST_MODIFIED]
+
+        try:
+            response = await async_get_session(self.hass).head(url, headers=headers)
+            if response.status == 304 and headers and self.data is not None:
+                return None
+            self.stats.conditional_misses += 1
+            self._content_length = int(response.headers.get(hdrs.CONTENT_LENGTH, 0))
+            return {
+                key: response.headers[key]
+                for key in (hdrs.ETAG, hdrs.LAST_MODIFIED)
+                if key in response.headers
+            }
+        except Exception as err:  # pylint: disable=broad-except
+            # The probe is only an optimisation, fall back to a full update
+            _LOGGER.debug("Environment Canada %s probe failed: %s", self._name, err)
+            return {}
+
+
+class ECRadarCoordinator(ECDataUpdateCoordinator):
+    """Radar coordinator that only refreshes while the camera is being viewed."""
+
+    def __init__(
+        self,
+        hass,
+        ec_data,
+        name,
+        update_interval,
+        idle_timeout,
+        prefetch=False,
+        scheduler=None,
+        store=None,
+        breaker=None,
+    ):
+        """Initialize the on-demand radar updater.
+
+        With prefetch set, the radar types that are not displayed are also
+        kept up to date in the background so switching between them is
+        instant.
+        """
+        super().__init__(
+            hass,
+            ec_data,
+            name,
+            update_interval,
+            scheduler=scheduler,
+            store=store,
+            breaker=breaker,
+        )
+        self.idle_timeout = idle_timeout
+        self.prefetch = prefetch
+        self.last_requested = None
+        self._catch_up = None
+        self._was_idle = False
+
+    @property
+    def idle(self):
+        """Return True if nobody has requested the radar image recently."""
+        if not self.idle_timeout:
+            return False
+        return (
+            self.last_requested is None
+            or utcnow() - self.last_requested > self.idle_timeout
+        )
+
+    async def async_request_image(self):
+        """Record a camera request, catching up if the radar was idle.
+
+        The catch-up refresh downloads and renders a whole loop, longer than
+        Home Assistant waits for a camera image, so requests only wait for it
+        when there is no image to serve yet.
+        """
+        if self.idle and self._catch_up is None:
+            self._catch_up = self.hass.async_create_task(self._async_catch_up())
+        self.last_requested = utcnow()
+        if self._catch_up is not None and getattr(self.data, "image", None) is None:
+            await asyncio.shield(self._catch_up)
+
+    async def _async_catch_up(self):
+        """Refresh immediately after an idle period."""
+        try:
+            await self.async_refresh()
+        finally:
+            self._catch_up = None
+
+    async def _async_fetch(self):
+        """Fetch radar from EC unless the camera is idle."""
+        if self.idle:
+            _LOGGER.debug("Radar camera idle, skipping %s update", self._name)
+            # Only the camera's radar_state changes, and only on the first
+            # idle update
+            self.data_changed = not self._was_idle
+            self._was_idle = True
+            return self.ec_data
+        self._was_idle = False
+        data = await super()._async_fetch()
+        if self.prefetch:
+            self.hass.async_create_task(self._async_prefetch())
+        return data
+
+    async def _async_prefetch(self):
+        """Update the radar types that are not displayed."""
+        try:
+            await self.ec_data.async_prefetch()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Radar prefetch failed: %s", err)
+
 
 class ECBaseEntity(CoordinatorEntity):
     """Common base for EC weather."""
@@ -134,6 +731,35 @@ class ECBaseEntity(CoordinatorEntity):
         self._coordinator = coordinator
         self._config = config
         self._name = name
+        self._last_snapshot = None
+
+    @property
+    def available(self):
+        """Return if there is data, fresh or restored from the cache."""
+        if self._coordinator.data is None:
+            return False
+        return super().available or self._coordinator.cached_at is not None
+
+    @callback
+    def _handle_coordinator_update(self):
+        """Write state only when this entity's state or attributes changed."""
+        if (
+            self._coordinator.data_changed
+            or self._last_snapshot is None
+            or not self.available
+        ):
+            snapshot = self._state_snapshot()
+            if snapshot != self._last_snapshot:
+                self._last_snapshot = snapshot
+                super()._handle_coordinator_update()
+                return
+        self._coordinator.stats.suppressed_writes += 1
+
+    def _state_snapshot(self):
+        """Return what a state write would record for this entity."""
+        if not self.available:
+            return None
+        return (self.state, self.state_attributes, self.extra_state_attributes)
 
     def get_value(self, key):
         """Get the value for a weather attribute."""
@@ -170,6 +796,7 @@ class ECBaseEntity(CoordinatorEntity):
             ATTR_OBSERVATION_TIME: self._coordinator.data.metadata.get("timestamp"),
             ATTR_LOCATION: self._coordinator.data.metadata.get("location"),
             ATTR_STATION: self._coordinator.data.metadata.get("station"),
+            ATTR_CACHED_AT: self._coordinator.cached_at,
         }
 
     @property
@@ -184,5 +811,5 @@ class ECBaseEntity(CoordinatorEntity):
         }
 
 
-class ECUpdateFailed(Exception):
+class ECUpdateFailed(UpdateFailed):
     """Raised when an update fails to get data from Environment Canada."""
@@ -0,0 +1,20 @@
+"""Air quality client for the Environment Canada integration."""
+import xml.etree.ElementTree as et
+
+from env_canada import ECAirQuality
+
+
+class MyECAirQuality(ECAirQuality):
+    """AQHI client that fetches through the shared EC session."""
+
+    def __init__(self, session, **kwargs):
+        """Init my AQHI client."""
+        super().__init__(**kwargs)
+        self.session = session
+
+    async def get_aqhi_data(self, url):
+        """Fetch and parse an AQHI feed of the region."""
+        response = await self.session.get(
+            url.format(self.zone_id, self.region_id), timeout=10
+        )
+        return et.fromstring((await response.read()).decode("ISO-8859-1"))
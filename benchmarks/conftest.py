@@ -0,0 +1,146 @@
+"""Fixtures for the offline Environment Canada benchmarks."""
+import asyncio
+import datetime
+import importlib.util
+import io
+import json
+from pathlib import Path
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+FIXTURES = Path(__file__).parent / "fixtures"
+
+# The repository root is the integration package itself
+_spec = importlib.util.spec_from_file_location(
+    "environment_canada2",
+    ROOT / "__init__.py",
+    submodule_search_locations=[str(ROOT)],
+)
+_module = importlib.util.module_from_spec(_spec)
+sys.modules["environment_canada2"] = _module
+_spec.loader.exec_module(_module)
+
+from environment_canada2.cache import _decode  # noqa: E402
+
+RADAR_FRAMES = 7
+RADAR_SIZE = (800, 800)
+RADAR_START = datetime.datetime(2021, 9, 20, 17, 0, tzinfo=datetime.timezone.utc)
+
+
+def load_fixture(name):
+    """Load a recorded EC payload in the on-disk cache format."""
+    stored = json.loads((FIXTURES / name).read_text(encoding="utf-8"))
+    return SimpleNamespace(**_decode(stored["data"]))
+
+
+def make_radar_frame(index):
+    """Return a PNG frame with a precipitation band that moves each frame."""
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGBA", RADAR_SIZE, (222, 230, 214, 255))
+    draw = ImageDraw.Draw(image)
+    for line in range(0, RADAR_SIZE[0], 40):
+        draw.line([(line, 0), (line, RADAR_SIZE[1])], fill=(180, 180, 180, 255))
+    offset = index * 30
+    for ring, colour in enumerate(
+        [(0, 160, 255, 200), (0, 200, 0, 200), (255, 200, 0, 200), (255, 0, 0, 200)]
+    ):
+        inset = ring * 40
+        draw.ellipse(
+            [200 + offset + inset, 250 + inset, 520 + offset - inset, 500 - inset],
+            fill=colour,
+        )
+    output = io.BytesIO()
+    image.save(output, format="PNG")
+    return output.getvalue()
+
+
+def make_radar_layer(index):
+    """Return a transparent PNG precipitation layer that moves each frame."""
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGBA", RADAR_SIZE, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    offset = index * 30
+    for ring, colour in enumerate(
+        [(0, 160, 255, 255), (0, 200, 0, 255), (255, 200, 0, 255), (255, 0, 0, 255)]
+    ):
+        inset = ring * 40
+        draw.ellipse(
+            [200 + offset + inset, 250 + inset, 520 + offset - inset, 500 - inset],
+            fill=colour,
+        )
+    output = io.BytesIO()
+    image.save(output, format="PNG")
+    return output.getvalue()
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """Return an event loop for running coroutines under the benchmark."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def hass(event_loop):
+    """Return a minimal stand-in for Home Assistant."""
+    hass = MagicMock()
+    hass.loop = event_loop
+    return hass
+
+
+@pytest.fixture(scope="session")
+def weather_data():
+    """Return the recorded citypage weather data."""
+    return load_fixture("weather.json")
+
+
+@pytest.fixture(scope="session")
+def aqhi_data():
+    """Return the recorded AQHI data."""
+    return load_fixture("aqhi.json")
+
+
+@pytest.fixture(scope="session")
+def radar_frames():
+    """Return composited radar frames keyed by frame time."""
+    return {
+        RADAR_START + datetime.timedelta(minutes=10 * index): make_radar_frame(index)
+        for index in range(RADAR_FRAMES + 1)
+    }
+
+
+@pytest.fixture
+def ec_server(event_loop, radar_frames):
+    """Return the URL of a local stand-in for the EC servers."""
+    from aiohttp import web
+
+    payload = radar_frames[RADAR_START]
+
+    async def handle(request):
+        return web.Response(body=payload, content_type="image/png")
+
+    app = web.Application()
+    app.router.add_route("*", "/{path:.*}", handle)
+    runner = web.AppRunner(app)
+    event_loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    event_loop.run_until_complete(site.start())
+    host, port = runner.addresses[0][:2]
+    yield f"http://{host}:{port}"
+    event_loop.run_until_complete(runner.cleanup())
+
+
+@pytest.fixture(scope="session")
+def radar_layers():
+    """Return precipitation layers as downloaded from EC, keyed by frame time."""
+    return {
+        RADAR_START + datetime.timedelta(minutes=10 * index): make_radar_layer(index)
+        for index in range(RADAR_FRAMES + 1)
+    }
@@ -0,0 +1,88 @@
+"""Benchmarks for the import time of the integration."""
+import json
+import subprocess
+import sys
+
+from conftest import ROOT
+import pytest
+
+# Already imported by a running Home Assistant, so not counted
+PRELOADED = [
+    "homeassistant.components.camera",
+    "homeassistant.components.sensor",
+    "homeassistant.components.weather",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.update_coordinator",
+]
+
+# Dependencies that should only load once they are needed
+HEAVY_MODULES = ["PIL", "env_canada", "imageio", "environment_canada2.radar"]
+
+IMPORT_SCRIPT = """
+import importlib, importlib.util, json, sys, time
+
+for name in {preloaded!r}:
+    importlib.import_module(name)
+
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location(
+    "environment_canada2", {init!r}, submodule_search_locations=[{root!r}]
+)
+module = importlib.util.module_from_spec(spec)
+sys.modules["environment_canada2"] = module
+spec.loader.exec_module(module)
+for name in {modules!r}:
+    importlib.import_module("environment_canada2." + name)
+print(json.dumps({{
+    "seconds": time.perf_counter() - start,
+    "loaded": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+PLATFORMS = {
+    "startup": ["config_flow", "sensor", "weather"],
+    "camera": ["camera", "radar"],
+}
+
+
+def import_integration(modules):
+    """Import the integration and modules in a fresh interpreter."""
+    script = IMPORT_SCRIPT.format(
+        preloaded=PRELOADED,
+        init=str(ROOT / "__init__.py"),
+        root=str(ROOT),
+        modules=modules,
+        heavy=HEAVY_MODULES,
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+@pytest.mark.parametrize("platforms", list(PLATFORMS))
+def test_import_time(benchmark, platforms):
+    """Import the integration and platforms, as Home Assistant does at startup.
+
+    The benchmark times the whole interpreter, the import alone is recorded
+    in extra_info.
+    """
+    results = []
+
+    def run():
+        results.append(import_integration(PLATFORMS[platforms]))
+
+    benchmark.pedantic(run, rounds=5, warmup_rounds=1)
+    benchmark.extra_info["import_seconds"] = min(r["seconds"] for r in results)
+    benchmark.extra_info["loaded"] = results[-1]["loaded"]
+
+
+def test_import_skips_imaging():
+    """Importing the integration leaves the radar and imaging stack unloaded.
+
+    This only covers the import, before any entry is set up. env_canada
+    star-imports its radar module from its package __init__, so setting up an
+    entry still loads PIL and imageio through the weather client.
+    """
+    assert import_integration(PLATFORMS["startup"])["loaded"] == []
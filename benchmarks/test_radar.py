@@ -0,0 +1,160 @@
+"""Benchmarks for radar loop generation."""
+import asyncio
+import io
+import time
+
+from conftest import RADAR_FRAMES, RADAR_SIZE
+from PIL import Image
+import pytest
+
+from environment_canada2.radar import (
+    LOOP_PAUSE_FRAMES,
+    PIL_FORMATS,
+    RADAR_FPS,
+    FrameCompositor,
+    MyECRadar,
+    composite_frame,
+    decode_image,
+    encode_loop,
+    transcode_loop,
+)
+
+
+def make_png(size, colour):
+    """Return a plain PNG image."""
+    output = io.BytesIO()
+    Image.new("RGB", size, colour).save(output, format="PNG")
+    return output.getvalue()
+
+
+BASEMAP = make_png(RADAR_SIZE, (222, 230, 214))
+LEGEND = make_png((70, 280), (255, 255, 255))
+
+
+async def max_loop_lag(coro):
+    """Run coro, returning the longest time the event loop was blocked."""
+    lag = 0.0
+    done = False
+
+    async def heartbeat():
+        nonlocal lag
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0)
+            lag = max(lag, time.perf_counter() - start)
+
+    task = asyncio.ensure_future(heartbeat())
+    try:
+        await coro
+    finally:
+        done = True
+        await task
+    return lag
+
+
+def stub_radar(radar_layers, workers=None):
+    """Return a radar whose network calls are served from the fixtures."""
+    radar = MyECRadar(coordinates=(45.4, -75.7), workers=workers)
+    times = sorted(radar_layers)
+
+    async def get_basemap():
+        return BASEMAP
+
+    async def get_legend():
+        return LEGEND
+
+    async def get_dimensions():
+        return radar.window
+
+    async def get_radar_image(session, frame_time):
+        return radar_layers[frame_time]
+
+    radar._get_basemap = get_basemap
+    radar._get_legend = get_legend
+    radar._get_dimensions = get_dimensions
+    radar._get_radar_image = get_radar_image
+    radar.window = (times[0], times[RADAR_FRAMES - 1])
+    return radar, times
+
+
+@pytest.mark.parametrize("compositor", ["pil", "numpy"])
+def test_composite_frames(benchmark, radar_layers, compositor):
+    """Composite the frames of a loop with the legend and timestamps."""
+    base = decode_image(BASEMAP)
+    legend = decode_image(LEGEND, "RGB")
+    legend_position = (RADAR_SIZE[0] - legend.width, 0)
+    font = MyECRadar(coordinates=(45.4, -75.7)).font
+    layers = [radar_layers[t] for t in sorted(radar_layers)[:RADAR_FRAMES]]
+
+    if compositor == "numpy":
+        pytest.importorskip("numpy")
+        frame_compositor = FrameCompositor(base, 65, legend, legend_position, font)
+
+        def composite_all():
+            frame_compositor.reset_palette()
+            return [
+                frame_compositor.composite(layer, "Rain @ 17:00") for layer in layers
+            ]
+
+    else:
+
+        def composite_all():
+            return [
+                composite_frame(
+                    base, 65, legend, legend_position, font, layer, "Rain @ 17:00"
+                )
+                for layer in layers
+            ]
+
+    assert len(benchmark(composite_all)) == RADAR_FRAMES
+
+
+@pytest.mark.parametrize("image_format", list(PIL_FORMATS))
+def test_encode_loop(benchmark, radar_frames, image_format):
+    """Encode a full radar loop."""
+    frames = [radar_frames[t] for t in sorted(radar_frames)[:RADAR_FRAMES]]
+    frames.extend([frames[-1]] * LOOP_PAUSE_FRAMES)
+    assert benchmark(encode_loop, frames, RADAR_FPS, image_format)
+
+
+def test_transcode_thumbnail(benchmark, radar_frames):
+    """Scale an encoded loop down to a dashboard thumbnail."""
+    frames = [radar_frames[t] for t in sorted(radar_frames)[:RADAR_FRAMES]]
+    image = encode_loop(frames, RADAR_FPS, "gif")
+    assert benchmark(transcode_loop, image, "gif", 300, 300)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_radar_update_cold(benchmark, event_loop, radar_layers, workers):
+    """Build the loop with every frame missing from the cache.
+
+    Records the longest event loop stall and the time each rendering step
+    took in the executor.
+    """
+    lags = []
+
+    def update():
+        radar, _ = stub_radar(radar_layers, workers)
+        lags.append(event_loop.run_until_complete(max_loop_lag(radar.update())))
+        radar.close()
+        return radar
+
+    radar = benchmark(update)
+    assert radar.image
+    benchmark.extra_info["max_loop_lag"] = max(lags)
+    benchmark.extra_info["render_steps"] = radar.render_steps
+
+
+def test_radar_update_incremental(benchmark, event_loop, radar_layers):
+    """Slide the loop forward by one frame, so only one frame is fetched."""
+    radar, times = stub_radar(radar_layers)
+    event_loop.run_until_complete(radar.update())
+
+    def update():
+        radar.window = (times[0], times[RADAR_FRAMES - 1])
+        event_loop.run_until_complete(radar.update())
+        radar.window = (times[1], times[RADAR_FRAMES])
+        event_loop.run_until_complete(radar.update())
+
+    benchmark(update)
+    assert radar.timestamp == times[RADAR_FRAMES]
@@ -0,0 +1,64 @@
+"""Benchmarks for EC requests with and without the pooled session."""
+import asyncio
+
+from aiohttp import ClientSession
+from conftest import RADAR_FRAMES
+
+from environment_canada2.session import ECSession
+
+
+def poll_urls(server):
+    """Return the requests of one poll of a station: weather, AQHI and radar."""
+    return [
+        f"{server}/citypage_weather/xml/ON/s0000430_e.xml",
+        f"{server}/air_quality/aqhi/ont/observation/realtime/xml/AQ_OBS_FAFFD.xml",
+        f"{server}/geomet?request=GetCapabilities",
+    ] + [f"{server}/geomet?request=GetMap&frame={i}" for i in range(RADAR_FRAMES)]
+
+
+async def fetch_unpooled(url):
+    """Fetch url the way the EC clients do, with a session of its own."""
+    async with ClientSession(raise_for_status=True) as session:
+        response = await session.get(url)
+        return await response.read()
+
+
+async def fetch_pooled(session, url):
+    """Fetch url through the shared EC session."""
+    response = await session.get(url)
+    return await response.read()
+
+
+def test_poll_unpooled(benchmark, event_loop, ec_server):
+    """Poll with a new connection per request."""
+    urls = poll_urls(ec_server)
+
+    async def poll_async():
+        return await asyncio.gather(*[fetch_unpooled(url) for url in urls])
+
+    def poll():
+        return event_loop.run_until_complete(poll_async())
+
+    assert all(benchmark(poll))
+
+
+def test_poll_pooled(benchmark, event_loop, ec_server):
+    """Poll over keep-alive connections reused across polls."""
+    urls = poll_urls(ec_server)
+
+    async def create_session():
+        return ClientSession()
+
+    client = event_loop.run_until_complete(create_session())
+    session = ECSession(client)
+
+    async def poll_async():
+        return await asyncio.gather(*[fetch_pooled(session, url) for url in urls])
+
+    def poll():
+        return event_loop.run_until_complete(poll_async())
+
+    try:
+        assert all(benchmark(poll))
+    finally:
+        event_loop.run_until_complete(client.close())
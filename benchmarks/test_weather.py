@@ -0,0 +1,91 @@
+"""Benchmarks for the weather and sensor hot paths."""
+import copy
+from datetime import timedelta
+
+import pytest
+
+from environment_canada2 import ECDataUpdateCoordinator
+from environment_canada2.const import AQHI_SENSOR, SENSOR_TYPES
+from environment_canada2.sensor import ALERTS, ECAlertSensor, ECSensor
+from environment_canada2.weather import get_forecast
+
+CONFIG = {
+    "station": "ON/s0000430",
+    "language": "English",
+    "latitude": 45.4,
+    "longitude": -75.7,
+    "name": "Ottawa",
+}
+
+
+def make_coordinator(hass, ec_data):
+    """Return a coordinator holding ec_data."""
+    coordinator = ECDataUpdateCoordinator(hass, ec_data, "bench", timedelta(minutes=5))
+    coordinator.data = ec_data
+    return coordinator
+
+
+@pytest.mark.parametrize("hourly", [False, True], ids=["daily", "hourly"])
+def test_get_forecast(benchmark, weather_data, hourly):
+    """Build the forecast array."""
+    forecast = benchmark(get_forecast, weather_data, hourly)
+    assert forecast
+
+
+@pytest.mark.parametrize("is_metric", [True, False], ids=["metric", "imperial"])
+def test_sensor_native_value(benchmark, hass, weather_data, is_metric):
+    """Read every sensor once after a coordinator update."""
+    coordinator = make_coordinator(hass, weather_data)
+    sensors = [
+        ECSensor(coordinator, CONFIG, description, is_metric)
+        for description in SENSOR_TYPES
+    ]
+
+    def read_all():
+        coordinator._derived = {}
+        return [sensor.native_value for sensor in sensors]
+
+    values = benchmark(read_all)
+    assert len(values) == len(SENSOR_TYPES)
+
+
+def test_aqhi_sensor_native_value(benchmark, hass, aqhi_data):
+    """Read the AQHI sensor after a coordinator update."""
+    coordinator = make_coordinator(hass, aqhi_data)
+    sensor = ECSensor(coordinator, CONFIG, AQHI_SENSOR, True)
+
+    def read():
+        coordinator._derived = {}
+        return sensor.native_value
+
+    assert benchmark(read) == aqhi_data.current
+
+
+def test_alert_sensor_native_value(benchmark, hass, weather_data):
+    """Read every alert sensor with its attributes."""
+    coordinator = make_coordinator(hass, weather_data)
+    sensors = [ECAlertSensor(coordinator, CONFIG, alert) for alert in ALERTS]
+
+    def read_all():
+        return [
+            (sensor.native_value, sensor.extra_state_attributes) for sensor in sensors
+        ]
+
+    assert benchmark(read_all)
+
+
+def test_coordinator_update(benchmark, hass, event_loop, weather_data):
+    """Run a coordinator update against a stubbed EC client."""
+
+    async def update():
+        """Stand in for the network fetch."""
+
+    # The fixture is shared by the session, stub the client on a copy
+    ec_data = copy.copy(weather_data)
+    ec_data.update = update
+    coordinator = make_coordinator(hass, ec_data)
+
+    result = benchmark(
+        lambda: event_loop.run_until_complete(coordinator._async_update_data())
+    )
+    assert result is ec_data
@@ -0,0 +1,127 @@
+"""Per-host circuit breakers shared by the Environment Canada coordinators."""
+from datetime import timedelta
+import logging
+import random
+import time
+
+from yarl import URL
+
+from homeassistant.core import callback
+
+from .const import DOMAIN
+
+DATA_BREAKERS = "breakers"
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Consecutive failures, from any coordinator, that open the circuit
+FAILURE_THRESHOLD = 3
+
+# Backoff after the first trip, doubled on each failed probe up to the maximum
+BASE_BACKOFF = 60
+MAX_BACKOFF = 30 * 60
+
+# A probe that has not reported back after this long no longer blocks others
+PROBE_TIMEOUT = 60
+
+# Extra random delay, in seconds, spreading callers refused by the circuit
+RETRY_JITTER = 30
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_get_breaker(hass, url):
+    """Return the circuit breaker of the host serving url."""
+    host = URL(url).host
+    breakers = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_BREAKERS, {})
+    if host not in breakers:
+        breakers[host] = CircuitBreaker(host)
+    return breakers[host]
+
+
+class CircuitBreaker:
+    """Circuit breaker for one EC host.
+
+    While closed every update goes through. After FAILURE_THRESHOLD
+    consecutive failures the circuit opens for a jittered, exponentially
+    growing backoff, during which updates are refused without touching the
+    network. Once the backoff expires the circuit is half open and lets a
+    single probe through: success closes it, failure opens it again.
+    """
+
+    def __init__(self, host):
+        """Initialize a closed breaker."""
+        self.host = host
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._retry_at = 0.0
+        self._probe_started = 0.0
+
+    def allow(self):
+        """Return True if an update may go to the host now."""
+        now = time.monotonic()
+        if self.state == STATE_CLOSED:
+            return True
+        if self.state == STATE_OPEN and now < self._retry_at:
+            return False
+        if self.state == STATE_HALF_OPEN and now - self._probe_started < PROBE_TIMEOUT:
+            return False
+        _LOGGER.debug("Probing Environment Canada host %s", self.host)
+        self.state = STATE_HALF_OPEN
+        self._probe_started = now
+        return True
+
+    def retry_delay(self):
+        """Return how long a refused caller should wait before trying again.
+
+        Each caller gets its own random share of RETRY_JITTER, so callers do
+        not all come back the moment the circuit half opens.
+        """
+        delay = max(self._retry_at - time.monotonic(), 0)
+        return timedelta(seconds=delay + random.uniform(0, RETRY_JITTER))
+
+    def record_success(self):
+        """Record a successful update, closing the circuit."""
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("Environment Canada host %s recovered", self.host)
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.trips = 0
+
+    def record_failure(self):
+        """Record a failed update, opening the circuit when it should trip."""
+        self.failures += 1
+        if self.state == STATE_CLOSED and self.failures < FAILURE_THRESHOLD:
+            return
+
+        self.trips += 1
+        backoff = min(BASE_BACKOFF * 2 ** (self.trips - 1), MAX_BACKOFF)
+        # Equal jitter: at least half the backoff, so retries never bunch at 0
+        backoff = random.uniform(backoff / 2, backoff)
+        self._retry_at = time.monotonic() + backoff
+        if self.state == STATE_CLOSED:
+            _LOGGER.warning(
+                "Environment Canada host %s unavailable, pausing updates for %ds",
+                self.host,
+                backoff,
+            )
+        else:
+            _LOGGER.debug(
+                "Environment Canada host %s still unavailable, retrying in %ds",
+                self.host,
+                backoff,
+            )
+        self.state = STATE_OPEN
+
+    def as_dict(self):
+        """Return the breaker state for diagnostics."""
+        return {
+            "host": self.host,
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+        }
@@ -0,0 +1,90 @@
+"""Last-known-good Environment Canada data persisted across restarts."""
+import base64
+from datetime import datetime
+
+from homeassistant.helpers.storage import Store
+from homeassistant.util import slugify
+import homeassistant.util.dt as dt_util
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
+
+# Attributes of the EC client objects that are persisted
+AQHI_FIELDS = ("current",)
+RADAR_FIELDS = ("image", "loop_format", "timestamp")
+WEATHER_FIELDS = (
+    "station_id",
+    "metadata",
+    "conditions",
+    "alerts",
+    "daily_forecasts",
+    "hourly_forecasts",
+)
+
+
+def _encode(value):
+    """Make value JSON serializable, tagging datetimes and bytes."""
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, bytes):
+        return {"__bytes__": base64.b64encode(value).decode("ascii")}
+    return value
+
+
+def _decode(value):
+    """Reverse _encode."""
+    if isinstance(value, dict):
+        if "__datetime__" in value:
+            return dt_util.parse_datetime(value["__datetime__"])
+        if "__bytes__" in value:
+            return base64.b64decode(value["__bytes__"])
+        return {key: _decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
+
+
+class ECDataStore:
+    """Persist selected attributes of an EC client object."""
+
+    def __init__(self, hass, key, fields):
+        """Initialize the store for a shared coordinator key."""
+        self._store = Store(hass, STORAGE_VERSION, storage_key(key))
+        self._fields = fields
+
+    async def async_restore(self, ec_data):
+        """Load the cached attributes into ec_data, returning when they were fetched."""
+        stored = await self._store.async_load()
+        if not stored:
+            return None
+        for field, value in _decode(stored["data"]).items():
+            setattr(ec_data, field, value)
+        return dt_util.parse_datetime(stored["fetched_at"])
+
+    def async_save(self, ec_data):
+        """Schedule saving the current attributes of ec_data."""
+        fetched_at = dt_util.utcnow().isoformat()
+        self._store.async_delay_save(
+            lambda: {
+                "fetched_at": fetched_at,
+                "data": _encode(
+                    {field: getattr(ec_data, field, None) for field in self._fields}
+                ),
+            },
+            STORAGE_SAVE_DELAY,
+        )
+
+    async def async_remove(self):
+        """Remove the cache from disk."""
+        await self._store.async_remove()
+
+
+def storage_key(key):
+    """Return the storage key of a shared coordinator key."""
+    return f"{DOMAIN}.{slugify('_'.join(str(part) for part in key))}"
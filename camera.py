@@ -4,23 +4,30 @@ import datetime
 
 import voluptuous as vol
 
-from homeassistant.components.camera import Camera
+from homeassistant.components.camera import Camera, async_get_still_stream
 from homeassistant.const import (
     ATTR_ATTRIBUTION,
     CONF_LATITUDE,
     CONF_LONGITUDE,
     CONF_NAME,
 )
-from homeassistant.helpers import entity_platform
+from homeassistant.helpers import entity_platform, entity_registry
 
-from . import ECBaseEntity
+from . import ECBaseEntity, async_acquire_radar_coordinator
 from .const import (
+    ATTR_CACHED_AT,
     ATTR_OBSERVATION_TIME,
     CONF_LANGUAGE,
+    CONF_RADAR_FORMAT,
     DEFAULT_NAME,
+    DEFAULT_RADAR_FORMAT,
     DOMAIN,
+    LOOP_PAUSE_FRAMES,
+    RADAR_FORMATS,
+    RADAR_FPS,
 )
 
+ATTR_RADAR_STATE = "radar_state"
 ATTR_UPDATED = "updated"
 
 CONF_LOOP = "loop"
@@ -37,10 +44,22 @@ SET_RADAR_TYPE_SCHEMA = {
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up the Environment Canada camera."""
+    image_format = config_entry.options.get(CONF_RADAR_FORMAT, DEFAULT_RADAR_FORMAT)
 
-    coordinator = hass.data[DOMAIN][config_entry.entry_id]["radar_coordinator"]
-
-    async_add_entities([ECCamera(coordinator, config_entry.data)], True)
+    registry = entity_registry.async_get(hass)
+    entity_id = registry.async_get_entity_id(
+        "camera", DOMAIN, radar_unique_id(config_entry.data)
+    )
+    if entity_id and registry.async_get(entity_id).disabled:
+        # A disabled camera is registered but never added, so it needs neither
+        # radar data nor the imaging dependencies
+        async_add_entities([ECCamera(None, config_entry.data, image_format)])
+        return
+
+    coordinator = await async_acquire_radar_coordinator(hass, config_entry)
+    async_add_entities(
+        [ECCamera(coordinator, config_entry.data, image_format)], True
+    )
 
     platform = entity_platform.async_get_current_platform()
     platform.async_register_entity_service(
@@ -48,28 +67,64 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     )
 
 
+def radar_unique_id(config):
+    """Return the unique ID of the radar camera of an entry."""
+    # The combination of coords and language are unique for all EC weather reporting
+    return f"{config[CONF_LATITUDE]}-{config[CONF_LONGITUDE]}-{config[CONF_LANGUAGE]}-radar"
+
+
 class ECCamera(ECBaseEntity, Camera):
     """Implementation of an Environment Canada radar camera."""
 
-    def __init__(self, coordinator, config):
+    def __init__(self, coordinator, config, image_format=DEFAULT_RADAR_FORMAT):
         """Initialize the EC camera."""
         name = f"{config.get(CONF_NAME, DEFAULT_NAME)} Radar"
         ECBaseEntity.__init__(self, coordinator, config, name)
         Camera.__init__(self)
 
-        self.content_type = "image/gif"
+        self.image_format = image_format
+        self.content_type = RADAR_FORMATS[image_format]
         self.image = None
         self.timestamp = None
 
     async def async_camera_image(
         self, width: int | None = None, height: int | None = None
     ) -> bytes | None:
-        """
-        Return bytes of camera image. Ignore width and height when
-        the image is fetched from url. Camera component will resize it.
-        """
+        """Return bytes of camera image, scaled to fit width and height."""
+        await self._coordinator.async_request_image()
+        if self._coordinator.data is None:
+            return None
         self.timestamp = self._coordinator.data.timestamp
-        return self._coordinator.data.image
+        return await self._coordinator.data.async_get_image(
+            width, height, self.image_format
+        )
+
+    async def handle_async_mjpeg_stream(self, request):
+        """Stream the radar loop one frame at a time."""
+        await self._coordinator.async_request_image()
+        radar = self._coordinator.data
+        if radar is None or not radar.frames:
+            return await super().handle_async_mjpeg_stream(request)
+
+        position = 0
+        frames = []
+
+        async def next_frame():
+            """Return the next frame, picking up new frames at the loop start."""
+            nonlocal position, frames
+            if position == 0:
+                await self._coordinator.async_request_image()
+                frames = await radar.async_get_jpeg_frames()
+                if not frames:
+                    return None
+                frames.extend([frames[-1]] * LOOP_PAUSE_FRAMES)
+            frame = frames[position]
+            position = (position + 1) % len(frames)
+            return frame
+
+        return await async_get_still_stream(
+            request, next_frame, "image/jpeg", 1 / RADAR_FPS
+        )
 
     @property
     def extra_state_attributes(self):
@@ -77,18 +132,22 @@ class ECCamera(ECBaseEntity, Camera):
         return {
             ATTR_ATTRIBUTION: self.attribution,
             ATTR_OBSERVATION_TIME: self.timestamp,
+            ATTR_RADAR_STATE: "idle" if self._coordinator.idle else "active",
+            ATTR_CACHED_AT: self._coordinator.cached_at,
         }
 
     async def async_set_radar_type(self, radar_type):
-        """Set the type of radar to display."""
-        self._coordinator.ec_data.precip_type = radar_type.lower()
-        await self._coordinator.async_config_entry_first_refresh()
+        """Set the type of radar to display, switching instantly when cached."""
+        if self._coordinator.ec_data.select(radar_type.lower()):
+            self.async_write_ha_state()
+            await self._coordinator.async_request_refresh()
+        else:
+            await self._coordinator.async_refresh()
 
     @property
     def unique_id(self):
         """Return unique ID."""
-        # The combination of coords and language are unique for all EC weather reporting
-        return f"{self._config[CONF_LATITUDE]}-{self._config[CONF_LONGITUDE]}-{self._config[CONF_LANGUAGE]}-radar"
+        return radar_unique_id(self._config)
 
     @property
     def device_info(self):
@@ -0,0 +1,131 @@
+"""Citypage weather client for the Environment Canada integration."""
+import re
+import xml.etree.ElementTree as et
+
+from env_canada import ECWeather, ec_weather
+
+import homeassistant.util.dt as dt_util
+
+
+class MyECWeather(ECWeather):
+    """Weather client that fetches through the shared EC session."""
+
+    def __init__(self, session, **kwargs):
+        """Init my weather client."""
+        super().__init__(**kwargs)
+        self.session = session
+
+    async def update(self):
+        """Fetch and parse the citypage feed of the station.
+
+        ECWeather.update opens a session of its own on every call and has no
+        fetch hook, so the download is done here and the XML is parsed as the
+        library does. Looking the station up by coordinates still uses the
+        library's site list download.
+        """
+        if not self.station_id and self.coordinates:
+            self.station_id = await ec_weather.closest_site(*self.coordinates)
+
+        response = await self.session.get(
+            ec_weather.WEATHER_URL.format(
+                date=dt_util.utcnow().strftime("%Y%m%d"),
+                site=self.station_id,
+                language=self.language[0],
+            ),
+            timeout=10,
+        )
+        try:
+            weather_tree = et.fromstring(
+                (await response.read()).decode("iso-8859-1")
+            )
+        except et.ParseError as err:
+            raise ec_weather.ECWeatherUpdateFailed("Weather update failed") from err
+        self.parse(weather_tree)
+
+    def parse(self, weather_tree):
+        """Update the data from a parsed citypage feed, as ECWeather.update."""
+        for key, meta in ec_weather.metadata_meta.items():
+            element = weather_tree.find(meta["xpath"])
+            if element is None:
+                self.metadata[key] = None
+            elif key == "timestamp":
+                self.metadata[key] = ec_weather.parse_timestamp(element.text)
+            else:
+                self.metadata[key] = element.text
+
+        for key, meta in ec_weather.conditions_meta.items():
+            self.conditions[key] = {"label": meta[self.language]}
+            self.conditions[key].update(_condition(weather_tree, meta))
+
+        summary_meta = ec_weather.summary_meta
+        period = _condition(weather_tree, summary_meta["forecast_period"])["value"]
+        summary = _condition(weather_tree, summary_meta["text_summary"])["value"]
+        self.conditions["text_summary"] = {
+            "label": summary_meta["label"][self.language],
+            "value": ". ".join([period, summary]),
+        }
+
+        for category, meta in ec_weather.alerts_meta.items():
+            self.alerts[category] = {"value": [], "label": meta[self.language]["label"]}
+        for event in weather_tree.findall("./warnings/event"):
+            title = event.attrib.get("description").strip()
+            for category, meta in ec_weather.alerts_meta.items():
+                if re.search(meta[self.language]["pattern"], title):
+                    self.alerts[category]["value"].append(
+                        {
+                            "title": title.title(),
+                            "date": event.find("./dateTime[last()]/textSummary").text,
+                        }
+                    )
+
+        self.forecast_time = ec_weather.parse_timestamp(
+            weather_tree.findtext("./forecastGroup/dateTime/timeStamp")
+        )
+        self.daily_forecasts = [
+            {
+                "period": forecast.findtext("period"),
+                "text_summary": forecast.findtext("textSummary"),
+                "icon_code": forecast.findtext("./abbreviatedForecast/iconCode"),
+                "temperature": int(forecast.findtext("./temperatures/temperature")),
+                "temperature_class": forecast.find(
+                    "./temperatures/temperature"
+                ).attrib.get("class"),
+                "precip_probability": int(
+                    forecast.findtext("./abbreviatedForecast/pop") or "0"
+                ),
+            }
+            for forecast in weather_tree.findall("./forecastGroup/forecast")
+        ]
+        self.hourly_forecasts = [
+            {
+                "period": ec_weather.parse_timestamp(
+                    forecast.attrib.get("dateTimeUTC")
+                ),
+                "condition": forecast.findtext("./condition"),
+                "temperature": int(forecast.findtext("./temperature")),
+                "icon_code": forecast.findtext("./iconCode"),
+                "precip_probability": int(forecast.findtext("./lop") or "0"),
+            }
+            for forecast in weather_tree.findall(
+                "./hourlyForecastGroup/hourlyForecast"
+            )
+        ]
+
+
+def _condition(weather_tree, meta):
+    """Return the value, and unit if any, of a citypage element."""
+    element = weather_tree.find(meta["xpath"])
+    if element is None or element.text is None:
+        return {"value": None}
+    if meta.get("attribute"):
+        return {"value": element.attrib.get(meta["attribute"])}
+
+    if meta["type"] == "int":
+        condition = {"value": int(float(element.text))}
+    elif meta["type"] == "float":
+        condition = {"value": 0.0 if element.text == "Trace" else float(element.text)}
+    else:
+        condition = {"value": element.text}
+    if element.attrib.get("units"):
+        condition["unit"] = element.attrib.get("units")
+    return condition
@@ -2,38 +2,90 @@
 import logging
 
 import aiohttp
-from env_canada import ECWeather
 import voluptuous as vol
 
 from homeassistant import config_entries, exceptions
 from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE, CONF_NAME
+from homeassistant.core import callback
 from homeassistant.helpers import config_validation as cv
 
-from .const import CONF_LANGUAGE, CONF_STATION, DOMAIN
+from .const import (
+    CONF_LANGUAGE,
+    CONF_RADAR_FORMAT,
+    CONF_RADAR_IDLE_TIMEOUT,
+    CONF_RADAR_PREFETCH,
+    CONF_RADAR_WORKERS,
+    CONF_STATION,
+    CONF_STATIONS,
+    DEFAULT_NAME,
+    DEFAULT_RADAR_FORMAT,
+    DEFAULT_RADAR_IDLE_TIMEOUT,
+    DEFAULT_RADAR_WORKERS,
+    DOMAIN,
+    RADAR_FORMATS,
+)
+from .session import async_get_session
+from .stations import async_get_catalogue
+
+# Number of stations offered when picking by coordinates
+NEAREST_COUNT = 10
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _stations(data):
+    """Return the stations of single station or fleet entry data."""
+    return set(data.get(CONF_STATIONS) or [data.get(CONF_STATION)])
+
+
 def already_configured(hass, data):
     """Check if same station and language is already configured."""
     for entry in hass.config_entries.async_entries(DOMAIN):
-        if (
-            entry.data.get(CONF_STATION) == data[CONF_STATION]
-            and entry.data.get(CONF_LANGUAGE) == data[CONF_LANGUAGE]
+        if entry.data.get(CONF_LANGUAGE) == data[CONF_LANGUAGE] and (
+            _stations(entry.data) & _stations(data)
         ):
             return True
     return False
 
 
-async def validate_input(data):
-    """Validate the user input allows us to connect."""
+async def async_load_catalogue(hass):
+    """Return the station catalogue, or None when it cannot be loaded."""
+    try:
+        return await async_get_catalogue(hass)
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.debug("Station catalogue unavailable: %s", err)
+        return None
+
+
+async def validate_input(hass, data):
+    """Validate the user input allows us to connect.
+
+    Stations are resolved from the local catalogue when it is available, and
+    only fall back to fetching the weather data when it is not.
+    """
     latitude = data.get(CONF_LATITUDE)
     longitude = data.get(CONF_LONGITUDE)
     station = data.get(CONF_STATION)
     language = data.get(CONF_LANGUAGE)
 
-    env_canada = ECWeather(
-        station_id=station, coordinates=(latitude, longitude), language=language.lower()
+    catalogue = await async_load_catalogue(hass)
+    if catalogue is not None:
+        if station:
+            if station not in catalogue:
+                raise BadStationId
+            return {"title": station, "name": catalogue.name(station)}
+        nearest = catalogue.nearest(latitude, longitude)
+        if not nearest:
+            raise BadStationId
+        return {"title": nearest[0][0], "name": nearest[0][1]}
+
+    from .citypage import MyECWeather  # pylint: disable=import-outside-toplevel
+
+    env_canada = MyECWeather(
+        async_get_session(hass),
+        station_id=station,
+        coordinates=(latitude, longitude),
+        language=language.lower(),
     )
     await env_canada.update()
     if env_canada.station_id is None:
@@ -42,6 +94,20 @@ async def validate_input(data):
     return {"title": env_canada.station_id, "name": env_canada.metadata["location"]}
 
 
+async def validate_fleet_input(hass, data):
+    """Validate a comma separated list of stations against the catalogue."""
+    stations = [
+        station.strip() for station in data[CONF_STATIONS].split(",") if station.strip()
+    ]
+    catalogue = await async_load_catalogue(hass)
+    if catalogue is None:
+        raise CannotConnect
+    if not stations or any(station not in catalogue for station in stations):
+        raise BadStationId
+
+    return {station: catalogue.name(station) for station in stations}
+
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Environment Canada weather."""
 
@@ -50,13 +116,34 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self):
         """Place to store data between steps."""
         self._data = {}
+        self._nearest = []
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
 
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
         errors = {}
+        if user_input is not None and user_input.get(CONF_STATIONS):
+            return await self.async_step_fleet(user_input)
+
+        if user_input is not None and not user_input.get(CONF_STATION):
+            catalogue = await async_load_catalogue(self.hass)
+            if catalogue is not None:
+                self._nearest = catalogue.nearest(
+                    user_input[CONF_LATITUDE],
+                    user_input[CONF_LONGITUDE],
+                    NEAREST_COUNT,
+                )
+                self._data = user_input
+                return await self.async_step_station()
+
         if user_input is not None:
             try:
-                info = await validate_input(user_input)
+                info = await validate_input(self.hass, user_input)
                 user_input[CONF_STATION] = info["title"]
                 user_input[CONF_NAME] = info["name"]
 
@@ -88,6 +175,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Optional(CONF_LANGUAGE, default="English"): vol.In(
                     ["English", "French"]
                 ),
+                vol.Optional(CONF_STATIONS): str,
             }
         )
 
@@ -95,6 +183,75 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="user", data_schema=data_schema, errors=errors
         )
 
+    async def async_step_fleet(self, user_input=None):
+        """Handle a list of stations monitored by one fleet entry."""
+        errors = {}
+        if user_input is not None:
+            try:
+                data = {
+                    CONF_STATIONS: await validate_fleet_input(self.hass, user_input),
+                    CONF_LANGUAGE: user_input[CONF_LANGUAGE],
+                    CONF_NAME: f"{DEFAULT_NAME} Fleet",
+                }
+                if not already_configured(self.hass, data):
+                    self._data = data
+                    return await self.async_step_name()
+
+                errors["base"] = "already_configured"
+
+            except BadStationId:
+                errors["base"] = "bad_station_id"
+            except CannotConnect:
+                errors["base"] = "cannot_connect"
+
+        user_input = user_input or {}
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_STATIONS, default=user_input.get(CONF_STATIONS, "")
+                ): str,
+                vol.Optional(
+                    CONF_LANGUAGE, default=user_input.get(CONF_LANGUAGE, "English")
+                ): vol.In(["English", "French"]),
+            }
+        )
+
+        return self.async_show_form(
+            step_id="fleet", data_schema=data_schema, errors=errors
+        )
+
+    async def async_step_station(self, user_input=None):
+        """Handle picking one of the stations nearest the coordinates."""
+        errors = {}
+        if user_input is not None:
+            self._data[CONF_STATION] = user_input[CONF_STATION]
+            self._data[CONF_NAME] = next(
+                name
+                for station, name, _ in self._nearest
+                if station == user_input[CONF_STATION]
+            )
+            if not already_configured(self.hass, self._data):
+                return await self.async_step_name()
+            errors["base"] = "already_configured"
+
+        if not self._nearest:
+            return self.async_abort(reason="no_stations")
+
+        data_schema = vol.Schema(
+            {
+                vol.Required(CONF_STATION, default=self._nearest[0][0]): vol.In(
+                    {
+                        station: f"{name} ({station}), {distance:.0f} km"
+                        for station, name, distance in self._nearest
+                    }
+                ),
+            }
+        )
+
+        return self.async_show_form(
+            step_id="station", data_schema=data_schema, errors=errors
+        )
+
     async def async_step_name(self, user_input=None):
         """Handle the name step."""
         errors = {}
@@ -113,5 +270,48 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle Environment Canada options."""
+
+    def __init__(self, config_entry):
+        """Initialize options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_RADAR_IDLE_TIMEOUT,
+                    default=options.get(
+                        CONF_RADAR_IDLE_TIMEOUT, DEFAULT_RADAR_IDLE_TIMEOUT
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_RADAR_FORMAT,
+                    default=options.get(CONF_RADAR_FORMAT, DEFAULT_RADAR_FORMAT),
+                ): vol.In(list(RADAR_FORMATS)),
+                vol.Optional(
+                    CONF_RADAR_PREFETCH,
+                    default=options.get(CONF_RADAR_PREFETCH, False),
+                ): bool,
+                vol.Optional(
+                    CONF_RADAR_WORKERS,
+                    default=options.get(CONF_RADAR_WORKERS, DEFAULT_RADAR_WORKERS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=8)),
+            }
+        )
+
+        return self.async_show_form(step_id="init", data_schema=data_schema)
+
+
 class BadStationId(exceptions.HomeAssistantError):
     """Error to indicate station ID is missing, invalid, or not in EC database."""
+
+
+class CannotConnect(exceptions.HomeAssistantError):
+    """Error to indicate the station catalogue could not be loaded."""
@@ -39,16 +39,52 @@ from homeassistant.const import (
 
 DOMAIN = "environment_canada2"
 
+ATTR_CACHED_AT = "cached_at"
 ATTR_OBSERVATION_TIME = "observation_time"
 ATTR_STATION = "station"
 
 CONF_LANGUAGE = "language"
+CONF_RADAR_FORMAT = "radar_format"
+CONF_RADAR_IDLE_TIMEOUT = "radar_idle_timeout"
+CONF_RADAR_PREFETCH = "radar_prefetch"
+CONF_RADAR_WORKERS = "radar_workers"
 CONF_STATION = "station"
+CONF_STATIONS = "stations"
 ATTRIBUTION_EN = "Data provided by Environment Canada"
 ATTRIBUTION_FR = "Données fournies par Environnement Canada"
 
 DEFAULT_NAME = "Environment Canada"
 
+# Sent with an entry ID once the camera has acquired the entry's radar coordinator
+SIGNAL_RADAR_COORDINATOR = f"{DOMAIN}_radar_coordinator_{{}}"
+
+# AQHI feed probed with conditional requests before a full update, the weather
+# feed URL comes from env_canada
+AQHI_OBSERVATION_URL = "https://dd.weather.gc.ca/air_quality/aqhi/{}/observation/realtime/xml/AQ_OBS_{}_CURRENT.xml"
+
+# Radar WMS service
+RADAR_URL = "https://geo.weather.gc.ca/geomet"
+
+DEFAULT_RADAR_FORMAT = "gif"
+
+# Radar loop output formats and their content types
+RADAR_FORMATS = {
+    "gif": "image/gif",
+    "webp": "image/webp",
+    "apng": "image/apng",
+}
+
+# Minutes without a camera request before radar updates pause, 0 to always poll
+DEFAULT_RADAR_IDLE_TIMEOUT = 15
+
+# Threads rendering the radar loop, off the event loop
+DEFAULT_RADAR_WORKERS = 2
+
+RADAR_FPS = 2
+
+# Number of times the last frame is repeated so the loop pauses on it
+LOOP_PAUSE_FRAMES = 2
+
 # Icon codes from:
 # https://dd.weather.gc.ca/citypage_weather/docs/forecast_conditions_icon_code_descriptions_e.csv
 EC_ICON_TO_HA_CONDITION_MAP = {
@@ -282,3 +318,38 @@ AQHI_SENSOR = ECSensorEntityDescription(
     native_unit_of_measurement=None,
     unit_convert=None,
 )
+
+TREND_SENSOR_TYPES: tuple[ECSensorEntityDescription, ...] = (
+    ECSensorEntityDescription(
+        key="pressure_change_3h",
+        name="Pressure Change 3h",
+        icon="mdi:gauge",
+        device_class=None,
+        native_unit_of_measurement=PRESSURE_HPA,
+        unit_convert=PRESSURE_INHG,
+    ),
+    ECSensorEntityDescription(
+        key="temperature_min_24h",
+        name="Minimum Temperature 24h",
+        icon="mdi:thermometer-chevron-down",
+        device_class=DEVICE_CLASS_TEMPERATURE,
+        native_unit_of_measurement=TEMP_CELSIUS,
+        unit_convert=TEMP_CELSIUS,
+    ),
+    ECSensorEntityDescription(
+        key="temperature_max_24h",
+        name="Maximum Temperature 24h",
+        icon="mdi:thermometer-chevron-up",
+        device_class=DEVICE_CLASS_TEMPERATURE,
+        native_unit_of_measurement=TEMP_CELSIUS,
+        unit_convert=TEMP_CELSIUS,
+    ),
+    ECSensorEntityDescription(
+        key="temperature_rate",
+        name="Temperature Change Rate",
+        icon="mdi:thermometer-lines",
+        device_class=None,
+        native_unit_of_measurement=f"{TEMP_CELSIUS}/h",
+        unit_convert=f"{TEMP_CELSIUS}/h",
+    ),
+)
@@ -0,0 +1,38 @@
+"""Diagnostics support for Environment Canada.
+
+The diagnostics platform needs Home Assistant 2022.2 or later, older releases
+never load this module.
+"""
+from .const import DOMAIN
+
+COORDINATORS = ("weather_coordinator", "radar_coordinator", "aqhi_coordinator")
+
+
+async def async_get_config_entry_diagnostics(hass, config_entry):
+    """Return the update statistics of a config entry's coordinators."""
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    if "fleet_coordinator" in entry_data:
+        fleet = entry_data["fleet_coordinator"]
+        return {
+            "fleet_coordinator": {
+                "update_interval": str(fleet.update_interval),
+                "last_update_success": fleet.last_update_success,
+                "failed_stations": sorted(fleet.failed),
+                "stats": fleet.stats.as_dict(),
+            }
+        }
+
+    diagnostics = {}
+    for name in COORDINATORS:
+        coordinator = entry_data.get(name)
+        if coordinator is None:
+            continue
+        diagnostics[name] = {
+            "update_interval": str(coordinator.update_interval),
+            "last_update_success": coordinator.last_update_success,
+            "cached_at": coordinator.cached_at,
+            "stats": coordinator.stats.as_dict(),
+        }
+        if coordinator.breaker:
+            diagnostics[name]["breaker"] = coordinator.breaker.as_dict()
+    return diagnostics
@@ -0,0 +1,147 @@
+"""Fleet mode: one coordinator fetching many Environment Canada stations."""
+import asyncio
+import logging
+import time
+
+from homeassistant.helpers.update_coordinator import (
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
+
+from .const import DOMAIN
+from .scheduler import staggered_interval
+from .session import async_get_session
+from .stats import ECUpdateStats
+
+# Maximum number of stations fetched at the same time
+FLEET_CONCURRENCY = 4
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ECFleetCoordinator(DataUpdateCoordinator):
+    """Fetch many stations per update with bounded concurrency.
+
+    A station that fails keeps its previous data and is reported unavailable,
+    the update only fails when every station failed.
+    """
+
+    def __init__(self, hass, stations, language, update_interval, phase=0.0):
+        """Initialize the fleet updater for a list of station IDs.
+
+        Polls land in the slot of the update interval given by phase, see
+        staggered_interval.
+        """
+        from .citypage import MyECWeather  # pylint: disable=import-outside-toplevel
+
+        session = async_get_session(hass)
+        self.ec_data = {
+            station: MyECWeather(
+                session, station_id=station, language=language.lower()
+            )
+            for station in stations
+        }
+        self.loaded = set()
+        self.failed = set()
+        self.generation = 0
+        self.stats = ECUpdateStats()
+        self.phase = phase
+        self._default_interval = update_interval
+        self._semaphore = asyncio.Semaphore(FLEET_CONCURRENCY)
+
+        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=update_interval)
+
+    async def _async_update_station(self, station):
+        """Fetch one station, waiting for a free slot."""
+        async with self._semaphore:
+            await self.ec_data[station].update()
+
+    async def _async_update_data(self):
+        """Fetch all stations from EC."""
+        start = time.monotonic()
+        results = await asyncio.gather(
+            *[self._async_update_station(station) for station in self.ec_data],
+            return_exceptions=True,
+        )
+
+        failed = set()
+        for station, result in zip(self.ec_data, results):
+            if isinstance(result, Exception):
+                _LOGGER.debug(
+                    "Environment Canada %s update failed: %s", station, result
+                )
+                failed.add(station)
+            else:
+                self.loaded.add(station)
+
+        if len(failed) == len(self.ec_data):
+            self.stats.record_failure()
+            raise UpdateFailed(
+                f"Environment Canada update failed for all {len(failed)} stations"
+            )
+
+        self.failed = failed
+        self.generation += 1
+        self.stats.record_success(time.monotonic() - start)
+        self.update_interval = staggered_interval(self._default_interval, self.phase)
+        return self.ec_data
+
+
+class ECFleetStation:
+    """Coordinator-like view of one station of an ECFleetCoordinator.
+
+    It provides what ECBaseEntity and CoordinatorEntity use, so the regular
+    weather and sensor entities work unchanged on fleet stations.
+    """
+
+    cached_at = None
+    history = None
+
+    def __init__(self, fleet, station):
+        """Initialize the view of station."""
+        self._fleet = fleet
+        self._station = station
+        self._derived = {}
+        self._generation = None
+
+    @property
+    def data(self):
+        """Return the station's EC data once it has been fetched."""
+        if self._station not in self._fleet.loaded:
+            return None
+        return self._fleet.ec_data[self._station]
+
+    @property
+    def last_update_success(self):
+        """Return True if the station's last update succeeded."""
+        return (
+            self._fleet.last_update_success
+            and self._station not in self._fleet.failed
+        )
+
+    @property
+    def data_changed(self):
+        """Return True if the last update fetched this station."""
+        return self._station not in self._fleet.failed
+
+    @property
+    def stats(self):
+        """Return the fleet's update statistics."""
+        return self._fleet.stats
+
+    def derived(self, key, builder):
+        """Return a value computed from the station data, built once per update."""
+        if self._generation != self._fleet.generation:
+            self._derived = {}
+            self._generation = self._fleet.generation
+        if key not in self._derived:
+            self._derived[key] = builder(self.data)
+        return self._derived[key]
+
+    def async_add_listener(self, update_callback):
+        """Listen for fleet updates."""
+        return self._fleet.async_add_listener(update_callback)
+
+    async def async_request_refresh(self):
+        """Request a refresh of the whole fleet."""
+        await self._fleet.async_request_refresh()
@@ -0,0 +1,106 @@
+"""Rolling observation history for Environment Canada trend sensors."""
+from array import array
+from datetime import timedelta
+import math
+
+# Observed fields kept in the history, keys of ECWeather.conditions
+HISTORY_FIELDS = ("temperature", "pressure", "humidity", "wind_speed")
+
+# Enough for a day of hourly observations, with room for extra ones
+HISTORY_CAPACITY = 64
+
+PRESSURE_CHANGE_PERIOD = timedelta(hours=3)
+EXTREMES_PERIOD = timedelta(hours=24)
+RATE_PERIOD = timedelta(hours=3)
+
+
+class ObservationHistory:
+    """Fixed-size ring buffer of observations, backed by arrays of floats.
+
+    Missing values are stored as NaN. Trends are recomputed once per new
+    observation and read from the trends dict, so sensors never scan the
+    buffer.
+    """
+
+    def __init__(self, capacity=HISTORY_CAPACITY):
+        """Initialize an empty history."""
+        self._capacity = capacity
+        self._times = array("d", [math.nan] * capacity)
+        self._values = {
+            field: array("d", [math.nan] * capacity) for field in HISTORY_FIELDS
+        }
+        self._next = 0
+        self._size = 0
+        self.trends = {}
+
+    def __len__(self):
+        """Return the number of observations held."""
+        return self._size
+
+    def record(self, ec_data):
+        """Record the current observation of ECWeather data if it is new."""
+        timestamp = ec_data.metadata.get("timestamp")
+        if timestamp is None:
+            return
+        seconds = timestamp.timestamp()
+        if self._size and seconds <= self._times[(self._next - 1) % self._capacity]:
+            return
+
+        self._times[self._next] = seconds
+        for field, values in self._values.items():
+            values[self._next] = _as_float(
+                ec_data.conditions.get(field, {}).get("value")
+            )
+        self._next = (self._next + 1) % self._capacity
+        self._size = min(self._size + 1, self._capacity)
+        self._update_trends()
+
+    def _window(self, field, period):
+        """Return (seconds, value) pairs within period of the newest, oldest first."""
+        newest = self._times[(self._next - 1) % self._capacity]
+        start = newest - period.total_seconds()
+        values = self._values[field]
+        window = []
+        for age in range(self._size, 0, -1):
+            index = (self._next - age) % self._capacity
+            if self._times[index] >= start and not math.isnan(values[index]):
+                window.append((self._times[index], values[index]))
+        return window
+
+    def _update_trends(self):
+        """Recompute the derived trends after a new observation."""
+        trends = {}
+
+        pressure = self._window("pressure", PRESSURE_CHANGE_PERIOD)
+        # Only report a change over (close to) the full period
+        if len(pressure) > 1 and pressure[-1][0] - pressure[0][0] >= (
+            PRESSURE_CHANGE_PERIOD.total_seconds() * 0.9
+        ):
+            # kPa to hPa
+            trends["pressure_change_3h"] = round(
+                (pressure[-1][1] - pressure[0][1]) * 10, 1
+            )
+
+        temperatures = [
+            value for _, value in self._window("temperature", EXTREMES_PERIOD)
+        ]
+        if temperatures:
+            trends["temperature_min_24h"] = min(temperatures)
+            trends["temperature_max_24h"] = max(temperatures)
+
+        recent = self._window("temperature", RATE_PERIOD)
+        if len(recent) > 1 and recent[-1][0] > recent[0][0]:
+            hours = (recent[-1][0] - recent[0][0]) / 3600
+            trends["temperature_rate"] = round(
+                (recent[-1][1] - recent[0][1]) / hours, 1
+            )
+
+        self.trends = trends
+
+
+def _as_float(value):
+    """Return value as a float, NaN when missing or not numeric."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
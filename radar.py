@@ -0,0 +1,530 @@
+"""Radar loop generation for the Environment Canada integration."""
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import datetime
+from functools import partial
+import io
+import logging
+import time
+import xml.etree.ElementTree as et
+
+import dateutil.parser
+from env_canada import ECRadar, ec_radar
+from PIL import Image, ImageDraw, ImageSequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, frames are composited by PIL without it
+    np = None
+
+from .const import LOOP_PAUSE_FRAMES, RADAR_FPS
+
+# EC publishes radar composites every 10 minutes
+FRAME_INTERVAL = datetime.timedelta(minutes=10)
+
+# Number of renditions (format and size) of the loop kept in memory
+MAX_RENDITIONS = 8
+
+# Radar layers EC publishes, "auto" picks one of them by month
+PRECIP_TYPES = ("rain", "snow")
+
+# Rendering steps timed per update, all run in the radar executor
+RENDER_STEPS = ("decode", "composite", "encode")
+
+# Pillow 9.1 moved the quantization methods into an enum
+FASTOCTREE = getattr(Image, "Quantize", Image).FASTOCTREE
+
+# PIL format and save options for each RADAR_FORMATS entry
+PIL_FORMATS = {
+    "gif": ("GIF", {}),
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "apng": ("PNG", {}),
+}
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def resolve_precip_type(radar_type):
+    """Return the layer displayed for radar_type, as ECRadar resolves "auto"."""
+    if radar_type != "auto":
+        return radar_type
+    return "rain" if datetime.date.today().month in range(4, 11) else "snow"
+
+
+def _timed(func, *args):
+    """Call func, returning its result and the seconds it took."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def decode_image(data, mode="RGBA"):
+    """Decode image bytes and convert them to mode."""
+    return Image.open(io.BytesIO(data)).convert(mode)
+
+
+def draw_label(font, label):
+    """Return the timestamp label box drawn at the top left of each frame."""
+    # Pillow 9.2 replaced getsize with getbbox and 10 removed getsize
+    if hasattr(font, "getbbox"):
+        size = font.getbbox(label)[2:]
+    else:
+        size = font.getsize(label)
+    text_box = Image.new("RGBA", size, "white")
+    ImageDraw.Draw(text_box).text((0, 0), label, fill=(0, 0, 0), font=font)
+    return text_box.resize((text_box.width * 2, text_box.height * 2))
+
+
+def _save_frame(frame):
+    """Encode a composited frame as PNG."""
+    output = io.BytesIO()
+    frame.save(output, format="PNG")
+    return output.getvalue()
+
+
+def opacity_table(opacity):
+    """Return the layer alpha composite_frame blends with, for each alpha.
+
+    Computed by PIL itself, so it rounds exactly as composite_frame does.
+    """
+    if opacity >= 100:
+        return list(range(256))
+    layer = Image.new("RGBA", (256, 1))
+    layer.putalpha(Image.frombytes("L", (256, 1), bytes(range(256))))
+    layer_copy = layer.copy()
+    layer_copy.putalpha(round(opacity / 100 * 255))
+    layer.paste(layer_copy, layer)
+    return list(layer.getchannel("A").getdata())
+
+
+def composite_frame(base, opacity, legend, legend_position, font, layer, label):
+    """Overlay a radar layer on the basemap and return the frame as PNG.
+
+    This is ECRadar._combine_layers without the network access, so it can
+    run off the event loop. Also returns the seconds spent decoding the
+    layer and compositing.
+    """
+    start = time.perf_counter()
+    radar = decode_image(layer)
+    decoded = time.perf_counter()
+
+    if opacity < 100:
+        radar_copy = radar.copy()
+        radar_copy.putalpha(round(opacity / 100 * 255))
+        radar.paste(radar_copy, radar)
+    frame = Image.alpha_composite(base, radar)
+
+    if legend is not None:
+        frame.paste(legend, legend_position)
+
+    if font is not None:
+        frame.paste(draw_label(font, label))
+        frame = frame.quantize()
+
+    return _save_frame(frame), decoded - start, time.perf_counter() - decoded
+
+
+class FrameCompositor:
+    """Composite radar frames with NumPy, matching composite_frame.
+
+    The basemap and legend are static, so they are converted to arrays once
+    and each radar layer is blended onto them with vectorized integer
+    operations, limited to the area with precipitation. The palette is
+    computed from the first frame after reset_palette and reused for the
+    others, instead of quantizing every frame from scratch, so only the
+    palette differs from composite_frame.
+    """
+
+    def __init__(self, base, opacity, legend=None, legend_position=None, font=None):
+        """Preallocate the static layers."""
+        self._base = np.asarray(base.convert("RGB"))
+        self._alpha = np.array(opacity_table(opacity), dtype=np.uint16)
+        self._legend = None
+        if legend is not None:
+            x, y = legend_position
+            self._legend = np.asarray(legend.convert("RGB"))
+            self._legend_area = np.s_[y : y + legend.height, x : x + legend.width]
+        self._font = font
+        self._palette = None
+
+    def reset_palette(self):
+        """Compute a new palette from the next frame."""
+        self._palette = None
+
+    def composite(self, layer, label):
+        """Overlay a radar layer on the basemap and return the frame as PNG.
+
+        The blend is the one PIL's alpha_composite does, to the bit.
+        """
+        start = time.perf_counter()
+        radar = decode_image(layer)
+        decoded = time.perf_counter()
+
+        frame = self._base.copy()
+        box = radar.getbbox()
+        if box is not None:
+            left, top, right, bottom = box
+            area = np.s_[top:bottom, left:right]
+            radar = np.asarray(radar)[area]
+            alpha = self._alpha[radar[..., 3]][..., None]
+            frame[area] = (
+                self._base[area] * (255 - alpha) + radar[..., :3] * alpha + 127
+            ) // 255
+
+        if self._legend is not None:
+            frame[self._legend_area] = self._legend
+
+        image = Image.fromarray(frame)
+        if self._font is not None:
+            image.paste(draw_label(self._font, label).convert("RGB"))
+            if self._palette is None:
+                image = self._palette = image.quantize(method=FASTOCTREE)
+            else:
+                # No dithering, the radar colours are flat
+                image = image.quantize(palette=self._palette, dither=0)
+
+        return _save_frame(image), decoded - start, time.perf_counter() - decoded
+
+
+def _save_loop(images, image_format, duration):
+    """Encode PIL images as an animated loop in image_format."""
+    output = io.BytesIO()
+    images[0].save(
+        output,
+        format=PIL_FORMATS[image_format][0],
+        save_all=True,
+        append_images=images[1:],
+        duration=duration,
+        loop=0,
+        **PIL_FORMATS[image_format][1],
+    )
+    return output.getvalue()
+
+
+def encode_loop(frames, fps, image_format, width=None, height=None):
+    """Encode PNG frames as an animated loop, scaled to fit width x height.
+
+    Unscaled GIF loops keep palette frames as they are, so frames sharing a
+    palette are not quantized again by the GIF encoder.
+    """
+    images = []
+    for frame in frames:
+        image = Image.open(io.BytesIO(frame))
+        if width or height:
+            image = image.convert("RGBA")
+            image.thumbnail((width or image.width, height or image.height))
+        elif image_format != "gif" or image.mode != "P":
+            image = image.convert("RGBA")
+        images.append(image)
+    return _save_loop(images, image_format, int(1000 / fps))
+
+
+def encode_jpeg(frame):
+    """Re-encode a PNG frame as JPEG for MJPEG streaming."""
+    output = io.BytesIO()
+    Image.open(io.BytesIO(frame)).convert("RGB").save(
+        output, format="JPEG", quality=85
+    )
+    return output.getvalue()
+
+
+def transcode_loop(image, image_format, width=None, height=None):
+    """Re-encode an animated loop in image_format, scaled to fit width x height."""
+    source = Image.open(io.BytesIO(image))
+    images = []
+    for frame in ImageSequence.Iterator(source):
+        frame = frame.convert("RGBA")
+        if width or height:
+            frame.thumbnail((width or frame.width, height or frame.height))
+        images.append(frame)
+    return _save_loop(images, image_format, source.info.get("duration", 0))
+
+
+class MyECRadar(ECRadar):
+    """Radar client caching frames between updates, fetching via the EC session."""
+
+    def __init__(self, coordinates, image_format="gif", session=None, workers=None):
+        """Init my radar.
+
+        Decoding, compositing and encoding run in an executor of workers
+        threads, or in the event loop's default executor without workers.
+        """
+        super().__init__(coordinates=coordinates, precip_type=None)
+        self.session = session
+        self.image = None
+        self.timestamp = None
+        self.image_format = image_format
+        self.loop_format = image_format
+        self.radar_type = "auto"
+        self.payload_bytes = 0
+        self.render_time = 0.0
+        self.render_steps = dict.fromkeys(RENDER_STEPS, 0.0)
+        self._executor = (
+            ThreadPoolExecutor(workers, thread_name_prefix="environment_canada_radar")
+            if workers
+            else None
+        )
+        self._base_image = None
+        self._legends = {}
+        self._compositors = {}
+        self._frame_sets = {}
+        self._loops = {}
+        self._lock = asyncio.Lock()
+        self._renditions = OrderedDict()
+        self._jpeg_frames = {}
+
+    def close(self):
+        """Stop the render executor once pending work is done."""
+        if self._executor:
+            self._executor.shutdown(wait=False)
+
+    async def _run(self, func, *args):
+        """Run func in the render executor."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, func, *args
+        )
+
+    @property
+    def layer_type(self):
+        """Return the precipitation layer of the displayed radar type."""
+        return resolve_precip_type(self.radar_type)
+
+    @property
+    def frames(self):
+        """Return the cached frames of the displayed radar type."""
+        return self._frame_sets.get(self.layer_type, {})
+
+    async def update(self):
+        """Refresh the radar loop, downloading only new frames."""
+        await self.async_update_loop(self.radar_type)
+        self.select(self.radar_type)
+
+    async def async_prefetch(self):
+        """Refresh the loops of the radar layers that are not displayed."""
+        for precip_type in PRECIP_TYPES:
+            if precip_type != self.layer_type:
+                await self.async_update_loop(precip_type)
+
+    def select(self, radar_type):
+        """Display radar_type, returning False if it has no cached loop yet."""
+        self.radar_type = radar_type
+        if self.layer_type not in self._loops:
+            return False
+        self.timestamp, self.image = self._loops[self.layer_type]
+        self.loop_format = self.image_format
+        return True
+
+    def frame_times(self, start, end):
+        """Return the timestamps of the frames between start and end."""
+        times = [start]
+        while times[-1] + FRAME_INTERVAL <= end:
+            times.append(times[-1] + FRAME_INTERVAL)
+        return times
+
+    async def _get_basemap(self):
+        """Fetch the background map image."""
+        params = dict(ec_radar.basemap_params, **self.map_params)
+        response = await self.session.get(ec_radar.basemap_url, params=params)
+        return await response.read()
+
+    async def _get_legend(self):
+        """Fetch the legend image of the current precipitation type."""
+        params = dict(
+            ec_radar.legend_params,
+            layer=self.layer,
+            style=ec_radar.legend_style[self.precip_type],
+        )
+        response = await self.session.get(ec_radar.geomet_url, params=params)
+        return await response.read()
+
+    async def _get_dimensions(self):
+        """Return the time range of the available radar frames."""
+        params = dict(ec_radar.capabilities_params, layer=self.layer)
+        response = await self.session.get(ec_radar.geomet_url, params=params)
+        capabilities = et.fromstring(
+            await response.text(), parser=et.XMLParser(encoding="utf-8")
+        )
+        dimension = capabilities.find(
+            ec_radar.dimension_xpath.format(layer=self.layer),
+            namespaces=ec_radar.wms_namespace,
+        ).text
+        start, end = [dateutil.parser.isoparse(t) for t in dimension.split("/")[:2]]
+        return start, end
+
+    async def async_update_loop(self, radar_type):
+        """Update the cached frames and loop of one radar type.
+
+        Frames are keyed by radar timestamp. Frames that have aged out of the
+        loop are evicted, and only the missing ones are downloaded and
+        composited. The loop is re-encoded only when the frame set changed.
+
+        Frames and loops are cached per precipitation layer, so "auto" shares
+        the cache of the layer it resolves to.
+        """
+        async with self._lock:
+            # The EC client fetches whichever layer precip_type resolves to
+            self.precip_type = radar_type
+            radar_type = self.precip_type
+
+            if not self.base_bytes:
+                self.base_bytes = await self._get_basemap()
+
+            start, end = await self._get_dimensions()
+            times = self.frame_times(start, end)
+
+            cached = self._frame_sets.get(radar_type, {})
+            frames = {t: f for t, f in cached.items() if t in times}
+            missing = [t for t in times if t not in frames]
+            _LOGGER.debug(
+                "Radar %s loop has %d frames, fetching %d",
+                radar_type,
+                len(times),
+                len(missing),
+            )
+            self._frame_sets[radar_type] = frames
+            if not missing and radar_type in self._loops:
+                self.payload_bytes = 0
+                self.render_time = 0.0
+                self.render_steps = dict.fromkeys(RENDER_STEPS, 0.0)
+                return
+
+            layers = await asyncio.gather(
+                *[self._get_radar_image(self.session, t) for t in missing]
+            )
+            self.payload_bytes = sum(len(layer) for layer in layers)
+
+            # Only the downloads above run on the event loop, the rendering
+            # is done in the executor, one frame per worker
+            render_start = time.monotonic()
+            steps = dict.fromkeys(RENDER_STEPS, 0.0)
+            rendered = await self._async_composite(missing, layers, steps)
+            for frame_time, (frame, decode_time, composite_time) in zip(
+                missing, rendered
+            ):
+                frames[frame_time] = frame
+                steps["decode"] += decode_time
+                steps["composite"] += composite_time
+
+            loop_frames = [frames[t] for t in times]
+            loop_frames.extend([loop_frames[-1]] * LOOP_PAUSE_FRAMES)
+            image, steps["encode"] = await self._run(
+                _timed, encode_loop, loop_frames, RADAR_FPS, self.image_format
+            )
+            self._loops[radar_type] = (times[-1], image)
+            self.render_time = time.monotonic() - render_start
+            self.render_steps = steps
+            _LOGGER.debug(
+                "Radar %s loop rendered in %.2fs off the event loop "
+                "(decode %.2fs, composite %.2fs, encode %.2fs)",
+                radar_type,
+                self.render_time,
+                *steps.values(),
+            )
+
+    async def _async_composite(self, frame_times, layers, steps):
+        """Composite radar layers into PNG frames in the executor.
+
+        Frames are composited with NumPy when it is installed, and with PIL
+        otherwise. The time spent decoding the basemap and legend is added
+        to steps.
+        """
+        if self._base_image is None:
+            self._base_image, steps["decode"] = await self._run(
+                _timed, decode_image, self.base_bytes
+            )
+        legend = legend_position = None
+        if self.show_legend:
+            if self.precip_type not in self._legends:
+                legend_bytes = await self._get_legend()
+                self._legends[self.precip_type], elapsed = await self._run(
+                    _timed, decode_image, legend_bytes, "RGB"
+                )
+                steps["decode"] += elapsed
+            legend = self._legends[self.precip_type]
+            legend_position = (self.width - legend.width, 0)
+        font = self.font if self.show_timestamp else None
+
+        if np is None:
+            composite = partial(
+                composite_frame,
+                self._base_image,
+                self.radar_opacity,
+                legend,
+                legend_position,
+                font,
+            )
+        else:
+            if self.precip_type not in self._compositors:
+                self._compositors[self.precip_type] = await self._run(
+                    FrameCompositor,
+                    self._base_image,
+                    self.radar_opacity,
+                    legend,
+                    legend_position,
+                    font,
+                )
+            compositor = self._compositors[self.precip_type]
+            compositor.reset_palette()
+            composite = compositor.composite
+
+        jobs = [
+            (layer, f"{self.precip_type.title()} @ {t.astimezone():%H:%M}")
+            for t, layer in zip(frame_times, layers)
+        ]
+        if not jobs:
+            # All frames are cached, only the loop is missing
+            return []
+        # The first frame picks the palette the others are quantized to
+        rendered = [await self._run(composite, *jobs[0])]
+        rendered.extend(
+            await asyncio.gather(*[self._run(composite, *job) for job in jobs[1:]])
+        )
+        return rendered
+
+    async def async_get_image(self, width=None, height=None, image_format=None):
+        """Return the loop in image_format, scaled to fit width x height.
+
+        Renditions are encoded once per radar timestamp, format and size and
+        kept in a small LRU cache, so repeated requests skip the re-encode.
+        """
+        image_format = image_format or self.image_format
+        if self.image is None:
+            return None
+        if image_format == self.loop_format and width is None and height is None:
+            return self.image
+
+        key = (self.layer_type, self.timestamp, image_format, width, height)
+        if key in self._renditions:
+            self._renditions.move_to_end(key)
+            return self._renditions[key]
+
+        if self.frames:
+            frames = [self.frames[t] for t in sorted(self.frames)]
+            frames.extend([frames[-1]] * LOOP_PAUSE_FRAMES)
+            encode = (encode_loop, frames, RADAR_FPS, image_format, width, height)
+        else:
+            # Restored from the cache, only the encoded loop is available
+            encode = (transcode_loop, self.image, image_format, width, height)
+        rendition = await self._run(*encode)
+
+        self._renditions[key] = rendition
+        while len(self._renditions) > MAX_RENDITIONS:
+            self._renditions.popitem(last=False)
+        return rendition
+
+    async def async_get_jpeg_frames(self):
+        """Return the loop frames as JPEGs, oldest first.
+
+        Each frame is encoded once and kept for as long as it is in the loop.
+        """
+        frames = self.frames
+        jpeg_frames = self._jpeg_frames.get(self.layer_type, {})
+        jpeg_frames = {t: f for t, f in jpeg_frames.items() if t in frames}
+        for frame_time in sorted(frames):
+            if frame_time not in jpeg_frames:
+                jpeg_frames[frame_time] = await self._run(
+                    encode_jpeg, frames[frame_time]
+                )
+        self._jpeg_frames[self.layer_type] = jpeg_frames
+        return [jpeg_frames[t] for t in sorted(jpeg_frames)]
@@ -0,0 +1,105 @@
+"""Publication-aware polling for Environment Canada feeds."""
+from collections import deque
+from datetime import timedelta
+import hashlib
+
+import homeassistant.util.dt as dt_util
+
+
+def polling_phase(*seed):
+    """Return a stable phase, from 0 to 1, for the poller identified by seed."""
+    digest = hashlib.sha256("/".join(map(str, seed)).encode()).digest()
+    return int.from_bytes(digest[:4], "big") / 2 ** 32
+
+
+def staggered_interval(interval, phase, now=None):
+    """Return the delay until the poll slot nearest to interval from now.
+
+    Slots repeat every interval, offset from the epoch by phase of an
+    interval. Pollers with different phases are spread over the interval
+    instead of all firing together, and stay spread across restarts.
+    """
+    now = now or dt_util.utcnow()
+    period = interval.total_seconds()
+    due = now.timestamp() + period
+    offset = (phase * period - due + period / 2) % period - period / 2
+    return interval + timedelta(seconds=offset)
+
+
+class PublicationScheduler:
+    """Learn when a feed publishes and pick the delay until the next poll.
+
+    EC publishes on a roughly fixed cadence per feed. The cadence is the
+    median gap between the last few publication times seen. Polls are
+    scheduled just after the next expected publication, are dense while a
+    publication is overdue, then back off until max_interval.
+
+    The phase staggers pollers: until the cadence is known they poll in
+    their own slot of default_interval, then they wait between one and two
+    lags after a publication.
+    """
+
+    def __init__(
+        self,
+        publication_time,
+        default_interval,
+        min_interval,
+        max_interval,
+        lag,
+        history=6,
+        phase=0.0,
+    ):
+        """Initialize the scheduler.
+
+        publication_time maps the EC data object to its publication datetime.
+        """
+        self._publication_time = publication_time
+        self.default_interval = default_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.lag = lag
+        self.phase = phase
+        self._published = deque(maxlen=history + 1)
+
+    def record(self, ec_data):
+        """Record the publication time of freshly fetched data."""
+        published = self._publication_time(ec_data)
+        if published is None:
+            return
+        if published.tzinfo is None:
+            published = published.replace(tzinfo=dt_util.UTC)
+        if not self._published or published > self._published[-1]:
+            self._published.append(published)
+
+    @property
+    def cadence(self):
+        """Return the learned publication interval, or None if not yet known."""
+        if len(self._published) < 2:
+            return None
+        published = list(self._published)
+        gaps = sorted(b - a for a, b in zip(published, published[1:]))
+        return gaps[len(gaps) // 2]
+
+    @property
+    def expected(self):
+        """Return when the next publication should be available."""
+        cadence = self.cadence
+        if cadence is None:
+            return None
+        return self._published[-1] + cadence + self.lag * (1 + self.phase)
+
+    def next_interval(self, now=None):
+        """Return the delay until the next poll."""
+        now = now or dt_util.utcnow()
+        expected = self.expected
+        if expected is None:
+            return staggered_interval(self.default_interval, self.phase, now)
+
+        if now < expected:
+            delay = expected - now
+        elif now - expected < self.cadence / 4:
+            delay = self.min_interval
+        else:
+            delay = (now - expected) / 2
+
+        return max(self.min_interval, min(delay, self.max_interval))
@@ -1,6 +1,7 @@
 """Sensors for Environment Canada (EC)."""
 import datetime
 
+from homeassistant import const as ha_const
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.const import (
     CONF_NAME,
@@ -8,22 +9,29 @@ from homeassistant.const import (
     LENGTH_METERS,
     LENGTH_MILES,
     PERCENTAGE,
+    PRESSURE_HPA,
     PRESSURE_INHG,
     PRESSURE_PA,
     SPEED_MILES_PER_HOUR,
     TEMP_CELSIUS,
+    TIME_MILLISECONDS,
 )
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.util.distance import convert as convert_distance
 from homeassistant.util.pressure import convert as convert_pressure
 
-from . import ECBaseEntity
+from . import ECBaseEntity, fleet_stations
 from .const import (
     AQHI_SENSOR,
     CONF_LANGUAGE,
     CONF_STATION,
+    CONF_STATIONS,
     DEFAULT_NAME,
     DOMAIN,
     SENSOR_TYPES,
+    SIGNAL_RADAR_COORDINATOR,
+    TREND_SENSOR_TYPES,
 )
 
 ALERTS = [
@@ -35,8 +43,26 @@ ALERTS = [
 ]
 MIN_TIME_BETWEEN_UPDATES = datetime.timedelta(minutes=5)
 
+STATS_FEEDS = ("weather", "aqhi")
+
+# Entity categories arrived in Home Assistant 2021.11, older releases show the
+# statistics sensors as regular sensors
+ENTITY_CATEGORY_DIAGNOSTIC = getattr(ha_const, "ENTITY_CATEGORY_DIAGNOSTIC", None)
+
+
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up the EC weather platform."""
+    if CONF_STATIONS in config_entry.data:
+        for coordinator, config in fleet_stations(hass, config_entry):
+            async_add_entities(
+                ECSensor(coordinator, config, description, hass.config.units.is_metric)
+                for description in SENSOR_TYPES
+            )
+            async_add_entities(
+                ECAlertSensor(coordinator, config, alert) for alert in ALERTS
+            )
+        return
+
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["weather_coordinator"]
     async_add_entities(
         ECSensor(
@@ -48,11 +74,131 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
         ECAlertSensor(coordinator, config_entry.data, alert) for alert in ALERTS
     )
 
+    async_add_entities(
+        ECTrendSensor(
+            coordinator, config_entry.data, description, hass.config.units.is_metric
+        )
+        for description in TREND_SENSOR_TYPES
+    )
+
     aqhi_coordinator = hass.data[DOMAIN][config_entry.entry_id]["aqhi_coordinator"]
     async_add_entities(
         [ECSensor(aqhi_coordinator, config_entry.data, AQHI_SENSOR, True)]
     )
 
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    async_add_entities(
+        ECStatsSensor(entry_data[f"{feed}_coordinator"], config_entry.data, feed)
+        for feed in STATS_FEEDS
+    )
+
+    # The radar coordinator only exists once an enabled camera acquired it,
+    # which may happen after this platform is set up, or never
+    @callback
+    def async_add_radar_stats(radar_coordinator):
+        """Add the radar statistics sensor."""
+        async_add_entities(
+            [ECStatsSensor(radar_coordinator, config_entry.data, "radar")]
+        )
+
+    if "radar_coordinator" in entry_data:
+        async_add_radar_stats(entry_data["radar_coordinator"])
+    else:
+        config_entry.async_on_unload(
+            async_dispatcher_connect(
+                hass,
+                SIGNAL_RADAR_COORDINATOR.format(config_entry.entry_id),
+                async_add_radar_stats,
+            )
+        )
+
+
+def _truncate(value):
+    """Truncate long strings to the maximum state length."""
+    if isinstance(value, str) and len(value) > 254:
+        return value[:254]
+    return value
+
+
+def _to_hpa(value):
+    """Convert kPa to hPa."""
+    return int(value * 10)
+
+
+def _metric_converter(description):
+    """Return the function converting a raw EC value for display."""
+    if description.key == "pressure":
+        return _to_hpa
+    if description.key == "tendency":
+        return str.title
+    return _truncate
+
+
+def _imperial_converter(description):
+    """Return the function converting a metric value to imperial units."""
+    unit_of_measurement = description.unit_convert
+    if unit_of_measurement == SPEED_MILES_PER_HOUR:
+        return lambda value: round(
+            convert_distance(value, LENGTH_KILOMETERS, LENGTH_MILES)
+        )
+    if unit_of_measurement == LENGTH_MILES:
+        return lambda value: round(
+            convert_distance(value, LENGTH_METERS, LENGTH_MILES)
+        )
+    if unit_of_measurement == PRESSURE_INHG:
+        return lambda value: round(
+            convert_pressure(value, PRESSURE_PA, PRESSURE_INHG), 2
+        )
+    if unit_of_measurement == TEMP_CELSIUS:
+        return lambda value: round(value, 1)
+    if unit_of_measurement == PERCENTAGE:
+        return round
+    return lambda value: value
+
+
+def _compile_converters(description):
+    """Return the (metric, imperial) converters of a sensor description."""
+    metric = _metric_converter(description)
+    imperial = _imperial_converter(description)
+    return metric, lambda value: imperial(metric(value))
+
+
+CONVERTERS = {
+    description.key: _compile_converters(description)
+    for description in (*SENSOR_TYPES, AQHI_SENSOR)
+}
+
+
+def build_sensor_view(data, descriptions):
+    """Return {key: (metric value, imperial value)} for all descriptions.
+
+    Built in one pass over the coordinator data so each sensor read is a
+    single lookup.
+    """
+    if descriptions == (AQHI_SENSOR,):
+        raw_values = {AQHI_SENSOR.key: data.current}
+    else:
+        conditions = data.conditions
+        hourly = data.hourly_forecasts[0] if data.hourly_forecasts else {}
+        raw_values = {}
+        for description in descriptions:
+            key = description.key
+            value = conditions.get(key, {}).get("value")
+            raw_values[key] = value if value else hourly.get(key)
+
+    view = {}
+    for key, value in raw_values.items():
+        if value is None:
+            view[key] = (None, None)
+        else:
+            metric, imperial = CONVERTERS[key]
+            try:
+                imperial_value = imperial(value)
+            except (TypeError, ValueError):
+                imperial_value = None
+            view[key] = (metric(value), imperial_value)
+    return view
+
 
 class ECSensor(ECBaseEntity, SensorEntity):
     """An EC Sensor Entity."""
@@ -76,33 +222,12 @@ class ECSensor(ECBaseEntity, SensorEntity):
     def native_value(self):
         """Return the state."""
         key = self._entity_description.key
-        value = self._coordinator.data.current if key == "aqhi" else self.get_value(key)
-
-        if value is None:
-            return None
-
-        if key == "pressure":
-            value = int(value * 10)  # Convert kPa to hPa
-        elif key == "tendency":
-            value = value.title()
-        elif isinstance(value, str) and len(value) > 254:
-            value = value[:254]
-
-        if self._is_metric:
-            return value
-
-        unit_of_measurement = self._entity_description.unit_convert
-        if unit_of_measurement == SPEED_MILES_PER_HOUR:
-            value = round(convert_distance(value, LENGTH_KILOMETERS, LENGTH_MILES))
-        elif unit_of_measurement == LENGTH_MILES:
-            value = round(convert_distance(value, LENGTH_METERS, LENGTH_MILES))
-        elif unit_of_measurement == PRESSURE_INHG:
-            value = round(convert_pressure(value, PRESSURE_PA, PRESSURE_INHG), 2)
-        elif unit_of_measurement == TEMP_CELSIUS:
-            value = round(value, 1)
-        elif unit_of_measurement == PERCENTAGE:
-            value = round(value)
-        return value
+        descriptions = (AQHI_SENSOR,) if key == "aqhi" else SENSOR_TYPES
+        view = self._coordinator.derived(
+            ("sensor_view", key == "aqhi"),
+            lambda data: build_sensor_view(data, descriptions),
+        )
+        return view[key][0 if self._is_metric else 1]
 
     @property
     def unique_id(self):
@@ -156,3 +281,91 @@ class ECAlertSensor(ECBaseEntity, SensorEntity):
     def icon(self):
         """Return the icon."""
         return self._alert_name[2]
+
+
+class ECTrendSensor(ECBaseEntity, SensorEntity):
+    """A sensor derived from the coordinator's observation history."""
+
+    def __init__(self, coordinator, config, description, is_metric):
+        """Initialise the sensor for a TREND_SENSOR_TYPES description."""
+        name = f"{config.get(CONF_NAME, DEFAULT_NAME)} {description.name}"
+        super().__init__(coordinator, config, name)
+
+        self._entity_description = description
+        self._is_metric = is_metric
+        if is_metric:
+            self._attr_native_unit_of_measurement = (
+                description.native_unit_of_measurement
+            )
+        else:
+            self._attr_native_unit_of_measurement = description.unit_convert
+        self._attr_device_class = description.device_class
+
+    @property
+    def native_value(self):
+        """Return the state."""
+        value = self._coordinator.history.trends.get(self._entity_description.key)
+        if value is None or self._is_metric:
+            return value
+        if self._entity_description.unit_convert == PRESSURE_INHG:
+            return round(convert_pressure(value, PRESSURE_HPA, PRESSURE_INHG), 2)
+        return value
+
+    @property
+    def unique_id(self):
+        """Return a unique_id for this entity."""
+        station = self._config[CONF_STATION]
+        lang = self._config[CONF_LANGUAGE]
+        return f"{station}-{lang}-{self._entity_description.key}"
+
+    @property
+    def icon(self):
+        """Return the icon."""
+        return self._entity_description.icon
+
+
+class ECStatsSensor(ECBaseEntity, SensorEntity):
+    """Diagnostic sensor reporting how a coordinator's updates perform."""
+
+    _attr_entity_category = ENTITY_CATEGORY_DIAGNOSTIC
+    _attr_native_unit_of_measurement = TIME_MILLISECONDS
+
+    def __init__(self, coordinator, config, feed):
+        """Initialise the sensor for the weather, radar or aqhi coordinator."""
+        label = "AQHI" if feed == "aqhi" else feed.title()
+        name = f"{config.get(CONF_NAME, DEFAULT_NAME)} {label} Update Latency"
+        super().__init__(coordinator, config, name)
+        self._feed = feed
+
+    @callback
+    def _handle_coordinator_update(self):
+        """Write state after every update, including unchanged and failed ones."""
+        self.async_write_ha_state()
+
+    @property
+    def available(self):
+        """Return True, the statistics are meaningful while updates fail."""
+        return True
+
+    @property
+    def native_value(self):
+        """Return the latency of the last successful update."""
+        latency = self._coordinator.stats.latency
+        return None if latency is None else round(latency * 1000)
+
+    @property
+    def extra_state_attributes(self):
+        """Return the full update statistics."""
+        return self._coordinator.stats.as_dict()
+
+    @property
+    def unique_id(self):
+        """Return a unique_id for this entity."""
+        station = self._config[CONF_STATION]
+        lang = self._config[CONF_LANGUAGE]
+        return f"{station}-{lang}-{self._feed}-update-latency"
+
+    @property
+    def icon(self):
+        """Return the icon."""
+        return "mdi:timer-outline"
@@ -0,0 +1,64 @@
+"""Shared HTTP session for Environment Canada requests."""
+import asyncio
+
+from aiohttp import hdrs
+from yarl import URL
+
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import DOMAIN
+
+DATA_SESSION = "session"
+
+# Requests in flight to each EC host, the rest wait for a pooled connection
+CONNECTIONS_PER_HOST = 4
+
+
+@callback
+def async_get_session(hass):
+    """Return the session shared by all EC requests of the integration."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_SESSION not in domain_data:
+        domain_data[DATA_SESSION] = ECSession(async_get_clientsession(hass))
+    return domain_data[DATA_SESSION]
+
+
+class ECSession:
+    """Keep-alive client session with a connection limit per EC host.
+
+    Wraps HA's shared client session, so connections (and their TLS sessions)
+    are pooled and reused across polls and coordinators instead of being set
+    up for every request. Responses are returned with their body read, which
+    frees the connection for the next request right away.
+    """
+
+    def __init__(self, session, limit_per_host=CONNECTIONS_PER_HOST):
+        """Initialize the session."""
+        self._session = session
+        self._limit_per_host = limit_per_host
+        self._hosts = {}
+
+    def _host_limit(self, url):
+        """Return the semaphore limiting requests to the host of url."""
+        host = URL(url).host
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self._limit_per_host)
+        return self._hosts[host]
+
+    async def request(self, method, url, **kwargs):
+        """Make a request, raising for error statuses."""
+        async with self._host_limit(url):
+            response = await self._session.request(
+                method, url, raise_for_status=True, **kwargs
+            )
+            await response.read()
+            return response
+
+    async def get(self, url, **kwargs):
+        """Make a GET request."""
+        return await self.request(hdrs.METH_GET, url, **kwargs)
+
+    async def head(self, url, **kwargs):
+        """Make a HEAD request."""
+        return await self.request(hdrs.METH_HEAD, url, **kwargs)
@@ -0,0 +1,182 @@
+"""Environment Canada station catalogue with a grid spatial index."""
+import csv
+from datetime import timedelta
+import logging
+import math
+
+from homeassistant.helpers.storage import Store
+from homeassistant.util import location
+import homeassistant.util.dt as dt_util
+
+from .const import DOMAIN
+from .session import async_get_session
+
+SITE_LIST_URL = "https://dd.weather.gc.ca/citypage_weather/docs/site_list_towns_en.csv"
+
+STORAGE_KEY = f"{DOMAIN}.stations"
+STORAGE_VERSION = 1
+CATALOGUE_MAX_AGE = timedelta(days=30)
+
+# Size of the spatial index grid cells, in degrees
+GRID_SIZE = 1.0
+
+# Semi-minor axis of the WGS84 ellipsoid, in km, so distances on the sphere of
+# this radius never exceed the distances location.distance returns
+EARTH_RADIUS_MIN = 6356.752
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _coordinate(value):
+    """Parse an EC coordinate like 45.40N or 75.72W to signed degrees."""
+    value = value.strip()
+    degrees = float(value[:-1])
+    return -degrees if value[-1] in "SW" else degrees
+
+
+def parse_site_list(text):
+    """Return [station_id, name, lat, lon] rows from the EC site list CSV."""
+    lines = text.splitlines()
+    # The CSV starts with a title line before the header
+    start = next(i for i, line in enumerate(lines) if line.startswith("Codes"))
+    stations = []
+    for row in csv.DictReader(lines[start:]):
+        try:
+            stations.append(
+                [
+                    f"{row['Province Codes']}/{row['Codes']}",
+                    row["English Names"],
+                    _coordinate(row["Latitude"]),
+                    _coordinate(row["Longitude"]),
+                ]
+            )
+        except (KeyError, TypeError, ValueError):
+            continue
+    return stations
+
+
+class StationCatalogue:
+    """EC weather stations indexed by grid cell for nearest lookups."""
+
+    def __init__(self, stations):
+        """Index [station_id, name, lat, lon] rows."""
+        self._stations = {row[0]: tuple(row[1:]) for row in stations}
+        self._grid = {}
+        for station_id, (_, lat, lon) in self._stations.items():
+            self._grid.setdefault(self._cell(lat, lon), []).append(station_id)
+
+    def __contains__(self, station_id):
+        """Return True if station_id is a known station."""
+        return station_id in self._stations
+
+    def __len__(self):
+        """Return the number of stations."""
+        return len(self._stations)
+
+    @staticmethod
+    def _cell(lat, lon):
+        """Return the grid cell of a coordinate."""
+        return (math.floor(lat / GRID_SIZE), math.floor(lon / GRID_SIZE))
+
+    def name(self, station_id):
+        """Return the name of a station."""
+        return self._stations[station_id][0]
+
+    def nearest(self, lat, lon, count=1):
+        """Return up to count (station_id, name, distance in km), nearest first.
+
+        Grid rings around the coordinate are searched outwards until the
+        count-th nearest station found so far is closer than any station the
+        unsearched rings could hold, so the result is exact.
+        """
+        if not self._stations:
+            return []
+        row, col = self._cell(lat, lon)
+        ranked = []
+        ring = 0
+        while ring <= 360 / GRID_SIZE:
+            for cell in self._ring(row, col, ring):
+                ranked.extend(
+                    (
+                        location.distance(lat, lon, *self._stations[station_id][1:])
+                        / 1000,
+                        station_id,
+                    )
+                    for station_id in self._grid.get(cell, ())
+                )
+            if len(ranked) >= count:
+                ranked.sort()
+                if ranked[count - 1][0] <= self._searched_radius(
+                    lat, lon, row, col, ring
+                ):
+                    break
+            ring += 1
+
+        ranked.sort()
+        return [
+            (station_id, self._stations[station_id][0], distance)
+            for distance, station_id in ranked[:count]
+        ]
+
+    @staticmethod
+    def _searched_radius(lat, lon, row, col, ring):
+        """Return a lower bound, in km, on the distance to cells beyond ring.
+
+        A station outside the searched rings is either outside their latitude
+        band, at least the latitude gap away, or outside their longitude band,
+        at least the distance to the nearest bounding meridian away.
+        """
+        lat_gap = min(
+            lat - (row - ring) * GRID_SIZE, (row + ring + 1) * GRID_SIZE - lat
+        )
+        lon_gap = min(
+            lon - (col - ring) * GRID_SIZE, (col + ring + 1) * GRID_SIZE - lon
+        )
+        meridian = math.asin(
+            math.cos(math.radians(lat)) * math.sin(math.radians(min(lon_gap, 90)))
+        )
+        return EARTH_RADIUS_MIN * min(math.radians(lat_gap), meridian)
+
+    @staticmethod
+    def _ring(row, col, ring):
+        """Return the cells at Chebyshev distance ring from (row, col)."""
+        if ring == 0:
+            return [(row, col)]
+        cells = []
+        for offset in range(-ring, ring + 1):
+            cells.extend(
+                [
+                    (row - ring, col + offset),
+                    (row + ring, col + offset),
+                    (row + offset, col - ring),
+                    (row + offset, col + ring),
+                ]
+            )
+        return set(cells)
+
+
+async def async_get_catalogue(hass):
+    """Return the station catalogue, downloading it when the disk copy is stale."""
+    if "station_catalogue" in hass.data.get(DOMAIN, {}):
+        return hass.data[DOMAIN]["station_catalogue"]
+
+    store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+    stored = await store.async_load()
+    fetched_at = stored and dt_util.parse_datetime(stored["fetched_at"])
+    stations = stored and stored["stations"]
+
+    if not stations or dt_util.utcnow() - fetched_at > CATALOGUE_MAX_AGE:
+        try:
+            response = await async_get_session(hass).get(SITE_LIST_URL)
+            stations = parse_site_list(await response.text())
+            await store.async_save(
+                {"fetched_at": dt_util.utcnow().isoformat(), "stations": stations}
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            if not stations:
+                raise
+            _LOGGER.debug("Using stale station catalogue: %s", err)
+
+    catalogue = StationCatalogue(stations)
+    hass.data.setdefault(DOMAIN, {})["station_catalogue"] = catalogue
+    return catalogue
@@ -0,0 +1,73 @@
+"""Update statistics for the Environment Canada coordinators."""
+from collections import deque
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 30)
+
+# Number of recent updates kept for the histogram
+LATENCY_WINDOW = 100
+
+
+class ECUpdateStats:
+    """Counters and timings of one coordinator's updates."""
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.successes = 0
+        self.failures = 0
+        self.latency = None
+        self.render_time = None
+        self.render_steps = None
+        self.payload_bytes = None
+        self.conditional_hits = 0
+        self.conditional_misses = 0
+        self.bytes_saved = 0
+        self.update_time_saved = 0.0
+        self.suppressed_writes = 0
+        self.rejected_updates = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def record_success(
+        self, latency, payload_bytes=None, render_time=None, render_steps=None
+    ):
+        """Record a successful update.
+
+        render_steps maps rendering steps to the seconds they took in the
+        executor, that is without blocking the event loop.
+        """
+        self.successes += 1
+        self.latency = latency
+        self.payload_bytes = payload_bytes
+        self.render_time = render_time
+        self.render_steps = render_steps
+        self._latencies.append(latency)
+
+    def record_failure(self):
+        """Record a failed update."""
+        self.failures += 1
+
+    def histogram(self):
+        """Return counts of recent latencies per bucket upper bound."""
+        counts = dict.fromkeys([*LATENCY_BUCKETS, "inf"], 0)
+        for latency in self._latencies:
+            bucket = next((b for b in LATENCY_BUCKETS if latency <= b), "inf")
+            counts[bucket] += 1
+        return {str(bucket): count for bucket, count in counts.items()}
+
+    def as_dict(self):
+        """Return the statistics for attributes and diagnostics."""
+        return {
+            "successes": self.successes,
+            "failures": self.failures,
+            "latency": self.latency,
+            "render_time": self.render_time,
+            "render_steps": self.render_steps,
+            "payload_bytes": self.payload_bytes,
+            "latency_histogram": self.histogram(),
+            "conditional_hits": self.conditional_hits,
+            "conditional_misses": self.conditional_misses,
+            "bytes_saved": self.bytes_saved,
+            "update_time_saved": round(self.update_time_saved, 3),
+            "suppressed_writes": self.suppressed_writes,
+            "rejected_updates": self.rejected_updates,
+        }
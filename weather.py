@@ -22,10 +22,11 @@ from homeassistant.util import dt
 from homeassistant.util.distance import convert as convert_distance
 from homeassistant.util.pressure import convert as convert_pressure
 
-from . import ECBaseEntity
+from . import ECBaseEntity, fleet_stations
 from .const import (
     CONF_LANGUAGE,
     CONF_STATION,
+    CONF_STATIONS,
     DEFAULT_NAME,
     DOMAIN,
     EC_ICON_TO_HA_CONDITION_MAP,
@@ -36,6 +37,14 @@ _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Add a weather entity from a config_entry."""
+    if CONF_STATIONS in config_entry.data:
+        async_add_entities(
+            ECWeather(coordinator, config, hass.config.units.is_metric, hourly)
+            for coordinator, config in fleet_stations(hass, config_entry)
+            for hourly in (False, True)
+        )
+        return
+
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["weather_coordinator"]
     async_add_entities(
         [
@@ -143,7 +152,10 @@ class ECWeather(ECBaseEntity, WeatherEntity):
     @property
     def forecast(self):
         """Return the forecast array."""
-        return get_forecast(self._coordinator.data, self._hourly)
+        return self._coordinator.derived(
+            ("forecast", self._hourly),
+            lambda data: get_forecast(data, self._hourly),
+        )
 
 
 def get_forecast(data, hourly_forecast):